@@ -3,11 +3,22 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from io import BytesIO
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.patches import Circle, Wedge, Rectangle
 import matplotlib.patches as mpatches
 
+from flare_archive import normalize_flare
+from flare_times import format_epochs, now_epoch, parse_epochs
+from game_rules import DEFENSE_STRATEGIES, IMPACTS, MISSION_PHASES, RANKS, SUCCESS_POINTS
+from impact_model import OUTPUTS, flare_features, load_model
+from render_cache import RenderCache, content_hash
+from terminal_renderer import StatusDashboard, default_terminal, progress_bar
+
 warnings.filterwarnings('ignore')
 
 # Professional design settings
@@ -24,7 +35,7 @@ print()
 
 
 class EnhancedSolarDefenderGame:
-    def __init__(self):
+    def __init__(self, http=requests, donki_url='https://api.nasa.gov/DONKI'):
         self.player_name = ""
         self.score = 0
         self.earth_health = 100
@@ -33,7 +44,13 @@ class EnhancedSolarDefenderGame:
         self.communications = 100
         self.solar_data = None
         self.api_key = 'DEMO_KEY'
+        # Anything with a requests-style get(); swapped for recorders/replayers in testing
+        self.http = http
+        self.donki_url = donki_url
         self.mission_history = []
+        self.render_cache = RenderCache()
+        self.terminal = default_terminal
+        self.status_dashboard = StatusDashboard(self.terminal)
         
         # Professional colors
         self.colors = {
@@ -45,143 +62,174 @@ class EnhancedSolarDefenderGame:
             'info': '#00ffff'
         }
 
+        # Background workers: the NASA download overlaps the intro and name
+        # prompt, and the mission report renders while the facts are shown
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='solar-defender')
+        self.solar_data_future = self.executor.submit(self.download_solar_data)
+        self.report_future = None
+
     def welcome_animation(self):
         """Special welcome message"""
-        print("\n" + "✨" * 50)
-        print("🎮 Welcome to Solar Defender Game! 🎮")
-        print("✨" * 50)
+        self.terminal.print(
+            "\n" + "✨" * 50,
+            "🎮 Welcome to Solar Defender Game! 🎮",
+            "✨" * 50
+        )
         time.sleep(1)
 
         for i in range(3):
-            print(f"\r🚀 Starting mission in {3 - i}...", end="")
+            self.terminal.write(f"\r🚀 Starting mission in {3 - i}...")
             time.sleep(1)
-        print("\r🎯 Mission started! Ready to protect Earth! 🌍        ")
+        self.terminal.print("\r🎯 Mission started! Ready to protect Earth! 🌍        ")
 
     def get_player_info(self):
         """Get player information"""
-        print("\n" + "👨‍🚀" * 20)
-        self.player_name = input("What's your name, Space Commander? 👉 ")
-        print(f"Welcome Commander {self.player_name}! Your mission: Protect Earth from solar storms!")
-
-    def fetch_solar_data(self):
-        """Fetch solar data from NASA"""
-        print("\n📡 Connecting to NASA satellites...")
+        self.terminal.print("\n" + "👨‍🚀" * 20)
+        self.player_name = self.terminal.prompt("What's your name, Space Commander? 👉 ")
+        self.terminal.print(f"Welcome Commander {self.player_name}! Your mission: Protect Earth from solar storms!")
 
+    def download_solar_data(self):
+        """Download NASA flare data in the background (no console output)"""
         try:
-            url = "https://api.nasa.gov/DONKI/FLR"
+            url = f"{self.donki_url}/FLR"
             params = {
                 'startDate': (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'),
                 'endDate': datetime.now().strftime('%Y-%m-%d'),
                 'api_key': self.api_key
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
                 if data:
-                    self.solar_data = self.process_real_data(data)
-                    print("✅ Received real data from NASA!")
-                    return True
+                    return self.process_real_data(data), 'nasa'
 
-            print("🔄 Using advanced simulation data...")
-            self.solar_data = self.create_simulation_data()
-            return True
+            return self.create_simulation_data(), 'simulation'
 
         except Exception as e:
-            print("🎮 Switching to game simulation mode...")
-            self.solar_data = self.create_simulation_data()
-            return True
+            return self.create_simulation_data(), 'offline'
+
+    def fetch_solar_data(self):
+        """Fetch solar data from NASA"""
+        self.terminal.print("\n📡 Connecting to NASA satellites...")
+
+        # The download started when the game was created; only wait for what is left
+        self.solar_data, source = self.solar_data_future.result()
+        self.score_flare_impacts()
+
+        if source == 'nasa':
+            self.terminal.print("✅ Received real data from NASA!")
+        elif source == 'simulation':
+            self.terminal.print("🔄 Using advanced simulation data...")
+        else:
+            self.terminal.print("🎮 Switching to game simulation mode...")
+        return True
 
     def process_real_data(self, data):
         """Process real NASA data"""
+        now = format_epochs([now_epoch()])[0]
         processed = []
         for flare in data[:7]:
             processed.append({
                 'id': flare.get('flareID', 'Unknown'),
                 'class': flare.get('classType', 'B1.0'),
-                'time': flare.get('beginTime', datetime.now().isoformat()),
+                'time': flare.get('beginTime', now),
                 'intensity': float(flare.get('classType', 'B1.0')[1:]) if len(
-                    flare.get('classType', 'B1.0')) > 1 else 1.0
+                    flare.get('classType', 'B1.0')) > 1 else 1.0,
+                'end_time': flare.get('endTime'),
+                'source': flare.get('sourceLocation'),
+                'linked_cme': normalize_flare(flare)['linkedCME']
             })
-        return processed
+        return self.add_epochs(processed)
+
+    def add_epochs(self, flares):
+        """Parse every flare's start/end time once, in one batch, into epoch seconds"""
+        begin = parse_epochs([flare['time'] for flare in flares])
+        end = parse_epochs([flare.get('end_time') for flare in flares])
+        for flare, begin_epoch, end_epoch in zip(flares, begin.tolist(), end.tolist()):
+            flare['epoch'] = begin_epoch
+            flare['end_epoch'] = end_epoch
+        return flares
 
     def create_simulation_data(self):
         """Create realistic simulation data"""
         flare_classes = ['B3.2', 'C1.5', 'M2.1', 'B7.8', 'X1.3', 'C5.6', 'M4.2']
+        times = format_epochs(now_epoch() - np.arange(len(flare_classes)) * 6 * 3600)
         simulation_data = []
 
         for i, flare_class in enumerate(flare_classes):
             simulation_data.append({
                 'id': f'SOLAR-FLARE-{i + 1}',
                 'class': flare_class,
-                'time': (datetime.now() - timedelta(hours=i * 6)).isoformat(),
+                'time': str(times[i]),
                 'intensity': float(flare_class[1:]) if len(flare_class) > 1 else 1.0
             })
 
-        return simulation_data
+        return self.add_epochs(simulation_data)
 
-    def calculate_impact(self, flare_class):
+    def score_flare_impacts(self):
+        """Score every flare with the impact model in one batch (kept off when no weights exist)"""
+        model = load_model()
+        if model is None or not self.solar_data:
+            return
+        features = flare_features([flare['class'] for flare in self.solar_data],
+                                  [flare['epoch'] for flare in self.solar_data],
+                                  [flare['end_epoch'] for flare in self.solar_data],
+                                  [flare.get('source') for flare in self.solar_data],
+                                  [flare.get('linked_cme', False) for flare in self.solar_data])
+        for flare, scores in zip(self.solar_data, model.predict(features)):
+            flare['impact_scores'] = dict(zip(OUTPUTS, np.round(scores).astype(int).tolist()))
+
+    def calculate_impact(self, flare_class, scores=None):
         """Calculate solar flare impact"""
-        impacts = {
-            'A': {'power': 0, 'satellites': 0, 'comm': 0, 'message': "Minimal impact", 'icon': '🌤️'},
-            'B': {'power': 5, 'satellites': 3, 'comm': 8, 'message': "Minor radio interference", 'icon': '📻'},
-            'C': {'power': 15, 'satellites': 10, 'comm': 20, 'message': "GPS and radio disruption", 'icon': '📡'},
-            'M': {'power': 30, 'satellites': 25, 'comm': 40, 'message': "Potential power grid fluctuations", 'icon': '⚡'},
-            'X': {'power': 50, 'satellites': 40, 'comm': 60, 'message': "Critical infrastructure at risk!", 'icon': '💥'}
-        }
-
         flare_type = flare_class[0] if flare_class else 'B'
-        return impacts.get(flare_type, impacts['B'])
-
-    def show_earth_status(self):
-        """Display current Earth status"""
-        print("\n" + "🌍" * 30)
-        print("📊 Earth Status Dashboard:")
-        print("🌍" * 30)
-
-        def progress_bar(value, label, max_value=100):
-            bars = int(value / max_value * 20)
-            if value >= 75:
-                color = '🟩'
-            elif value >= 50:
-                color = '🟨'
-            elif value >= 25:
-                color = '🟧'
-            else:
-                color = '🟥'
-            return f"{label}: |{color * bars}{'⬜' * (20 - bars)}| {value}%"
-
-        print(progress_bar(self.earth_health, "🌍 Earth Health"))
-        print(progress_bar(self.power_grid, "⚡ Power Grid"))
-        print(progress_bar(self.satellites, "🛰️ Satellites"))
-        print(progress_bar(self.communications, "📡 Communications"))
-        print(f"🎯 Player Score: {self.score}")
+        impact = dict(IMPACTS.get(flare_type, IMPACTS['B']))
+        if scores:
+            # Model predictions replace the table's damage numbers; the table stays as fallback
+            impact.update({key: scores[key] for key in ('power', 'satellites', 'comm')})
+        return impact
+
+    def show_earth_status(self, fresh=False):
+        """Display current Earth status (fresh=True never redraws in place)"""
+        # One frame; on ANSI terminals an unchanged dashboard only rewrites what moved
+        self.status_dashboard.draw([
+            "",
+            "🌍" * 30,
+            "📊 Earth Status Dashboard:",
+            "🌍" * 30,
+            progress_bar(self.earth_health, "🌍 Earth Health"),
+            progress_bar(self.power_grid, "⚡ Power Grid"),
+            progress_bar(self.satellites, "🛰️ Satellites"),
+            progress_bar(self.communications, "📡 Communications"),
+            f"🎯 Player Score: {self.score}"
+        ], fresh=fresh)
 
     def handle_solar_flare(self, flare_data):
         """Handle incoming solar flare"""
         flare_class = flare_data['class']
-        impact = self.calculate_impact(flare_class)
-
-        print(f"\n{impact['icon']} Incoming Solar Flare: {flare_class}")
-        print(f"📢 {impact['message']}")
-
-        print("\n🎮 Quick action required!")
-        print("Choose defense strategy:")
-        print("1. 🛡️ Deploy satellite shields (-10 points)")
-        print("2. ⚡ Activate grid protection (-15 points)")
-        print("3. 📡 Boost communications (-8 points)")
-        print("4. 🎯 Integrated defense (-20 points)")
+        impact = self.calculate_impact(flare_class, flare_data.get('impact_scores'))
+
+        self.terminal.print(
+            f"\n{impact['icon']} Incoming Solar Flare: {flare_class}",
+            f"📢 {impact['message']}",
+            "\n🎮 Quick action required!",
+            "Choose defense strategy:",
+            f"1. 🛡️ Deploy satellite shields (-{DEFENSE_STRATEGIES[1]['cost']} points)",
+            f"2. ⚡ Activate grid protection (-{DEFENSE_STRATEGIES[2]['cost']} points)",
+            f"3. 📡 Boost communications (-{DEFENSE_STRATEGIES[3]['cost']} points)",
+            f"4. 🎯 Integrated defense (-{DEFENSE_STRATEGIES[4]['cost']} points)"
+        )
 
         while True:
             try:
-                choice = int(input("Enter your choice (1-4): "))
+                choice = int(self.terminal.prompt("Enter your choice (1-4): "))
                 if 1 <= choice <= 4:
                     break
                 else:
-                    print("Please enter a number between 1 and 4")
+                    self.terminal.print("Please enter a number between 1 and 4")
             except:
-                print("Please enter a valid number")
+                self.terminal.print("Please enter a valid number")
 
         defense_success = self.apply_defense_strategy(choice, impact)
         
@@ -193,10 +241,10 @@ class EnhancedSolarDefenderGame:
         })
 
         if defense_success:
-            self.score += 25
-            print("✅ Excellent defense! Earth is safe!")
+            self.score += SUCCESS_POINTS
+            self.terminal.print("✅ Excellent defense! Earth is safe!")
         else:
-            print("🔄 Partial success. Some damage occurred.")
+            self.terminal.print("🔄 Partial success. Some damage occurred.")
 
         return defense_success
 
@@ -204,27 +252,23 @@ class EnhancedSolarDefenderGame:
         """Apply chosen defense strategy"""
         success = True
 
-        if choice == 1:
-            self.satellites = max(0, self.satellites - impact['satellites'] + 15)
-            self.score -= 10
-            print("🛡️ Satellite shields activated! Protecting space assets!")
-
-        elif choice == 2:
-            self.power_grid = max(0, self.power_grid - impact['power'] + 20)
-            self.score -= 15
-            print("⚡ Grid protection activated! Stabilizing power flow!")
-
-        elif choice == 3:
-            self.communications = max(0, self.communications - impact['comm'] + 12)
-            self.score -= 8
-            print("📡 Communications boosted! Maintaining global connection!")
-
-        elif choice == 4:
-            self.power_grid = max(0, self.power_grid - impact['power'] + 10)
-            self.satellites = max(0, self.satellites - impact['satellites'] + 8)
-            self.communications = max(0, self.communications - impact['comm'] + 10)
-            self.score -= 20
-            print("🎯 Integrated defense activated! Full protection active!")
+        strategy = DEFENSE_STRATEGIES[choice]
+        recovery = strategy['recovery']
+        if 'power' in recovery:
+            self.power_grid = max(0, self.power_grid - impact['power'] + recovery['power'])
+        if 'satellites' in recovery:
+            self.satellites = max(0, self.satellites - impact['satellites'] + recovery['satellites'])
+        if 'comm' in recovery:
+            self.communications = max(0, self.communications - impact['comm'] + recovery['comm'])
+        self.score -= strategy['cost']
+
+        messages = {
+            1: "🛡️ Satellite shields activated! Protecting space assets!",
+            2: "⚡ Grid protection activated! Stabilizing power flow!",
+            3: "📡 Communications boosted! Maintaining global connection!",
+            4: "🎯 Integrated defense activated! Full protection active!"
+        }
+        self.terminal.print(messages[choice])
 
         self.earth_health = (self.power_grid + self.satellites + self.communications) // 3
 
@@ -235,7 +279,44 @@ class EnhancedSolarDefenderGame:
         if not self.solar_data:
             return
 
+        # Reuse a report already rendered in the background when there is one
+        if self.report_future is None:
+            self.report_future = self.executor.submit(self.render_mission_report)
+        preview = self.report_future.result()
+
+        # Only the finished image touches pyplot (GUI backends need the main thread)
         fig = plt.figure(figsize=(20, 14), facecolor='#0a0a0a')
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.imshow(preview)
+        ax.axis('off')
+        plt.show()
+
+    def render_mission_report(self, path='solar_defender_report.png'):
+        """Render the mission analysis figure off-screen, save it and return a screen preview"""
+        state = {
+            'solar_data': self.solar_data,
+            'mission_history': self.mission_history,
+            'score': self.score,
+            'systems': [self.power_grid, self.satellites, self.communications]
+        }
+        key = content_hash(state, artifact='mission_report', dpi=300)
+
+        report = self.render_cache.get(key, 'png')
+        preview = self.render_cache.get(key, 'preview.png')
+        if report is None or preview is None:
+            report, preview = self.build_mission_report()
+            self.render_cache.put(key, 'png', report)
+            self.render_cache.put(key, 'preview.png', preview)
+
+        with open(path, 'wb') as handle:
+            handle.write(report)
+        return plt.imread(BytesIO(preview), format='png')
+
+    def build_mission_report(self):
+        """Build the mission analysis figure and return (report PNG, preview PNG) bytes"""
+        # Figure + Agg canvas instead of pyplot so this is safe in a worker thread
+        fig = Figure(figsize=(20, 14), facecolor='#0a0a0a')
+        FigureCanvasAgg(fig)
         fig.suptitle('🎮 Solar Defender - Mission Analysis',
                      fontsize=24, color='#00ffff', fontweight='bold', y=0.98)
 
@@ -269,9 +350,12 @@ class EnhancedSolarDefenderGame:
         ax7 = fig.add_subplot(gs[2, 2])
         self.create_mission_log(ax7)
 
-        plt.tight_layout()
-        plt.savefig('solar_defender_report.png', dpi=300, facecolor='#0a0a0a')
-        plt.show()
+        fig.tight_layout()
+        preview = BytesIO()
+        fig.savefig(preview, format='png', dpi=100, facecolor='#0a0a0a')
+        report = BytesIO()
+        fig.savefig(report, format='png', dpi=300, facecolor='#0a0a0a')
+        return report.getvalue(), preview.getvalue()
 
     def create_enhanced_pie_chart(self, ax):
         """Professional pie chart"""
@@ -396,7 +480,7 @@ class EnhancedSolarDefenderGame:
         }
 
         for flare in self.solar_data[:5]:
-            impact = self.calculate_impact(flare['class'])
+            impact = self.calculate_impact(flare['class'], flare.get('impact_scores'))
             total_impact = impact['power'] + impact['satellites'] + impact['comm']
             flare_impacts.append(total_impact)
             flare_labels.append(flare['class'])
@@ -421,7 +505,7 @@ class EnhancedSolarDefenderGame:
     def create_performance_gauge(self, ax):
         """Performance Gauge"""
         # Calculate performance percentage
-        max_score = len(self.solar_data) * 25
+        max_score = len(self.solar_data) * SUCCESS_POINTS
         performance = (self.score / max_score * 100) if max_score > 0 else 0
 
         # Background circle
@@ -555,31 +639,37 @@ class EnhancedSolarDefenderGame:
             "🔭 NASA's Solar Dynamics Observatory monitors the Sun 24/7 to protect Earth!"
         ]
 
-        print("\n" + "📚" * 20)
-        print("🎓 Space Weather Facts for Kids:")
-        print("📚" * 20)
+        self.terminal.print(
+            "\n" + "📚" * 20,
+            "🎓 Space Weather Facts for Kids:",
+            "📚" * 20
+        )
 
         for i, fact in enumerate(facts[:4]):
-            print(f"{i + 1}. {fact}")
+            self.terminal.print(f"{i + 1}. {fact}")
             time.sleep(1.5)
 
     def game_loop(self):
         """Main game loop"""
-        print("\n" + "🎮" * 30)
-        print("Starting Solar Defense Mission...")
-        print("🎮" * 30)
+        self.terminal.print(
+            "\n" + "🎮" * 30,
+            "Starting Solar Defense Mission...",
+            "🎮" * 30
+        )
 
         # Process each solar flare
-        for i, flare in enumerate(self.solar_data[:5]):
-            print(f"\n🌀 Mission Phase {i + 1}/5")
-            print("=" * 40)
+        for i, flare in enumerate(self.solar_data[:MISSION_PHASES]):
+            self.terminal.print(
+                f"\n🌀 Mission Phase {i + 1}/{MISSION_PHASES}",
+                "=" * 40
+            )
 
             self.handle_solar_flare(flare)
             self.show_earth_status()
 
             # Check for game over
             if self.earth_health <= 0:
-                print("\n💀 Mission Failed: Earth's systems collapsed!")
+                self.terminal.print("\n💀 Mission Failed: Earth's systems collapsed!")
                 break
 
             time.sleep(2)
@@ -589,35 +679,32 @@ class EnhancedSolarDefenderGame:
 
     def show_final_results(self):
         """Display final game results"""
-        print("\n" + "🏆" * 30)
-        print("🎯 Mission Complete - Final Results:")
-        print("🏆" * 30)
+        self.terminal.print(
+            "\n" + "🏆" * 30,
+            "🎯 Mission Complete - Final Results:",
+            "🏆" * 30
+        )
 
-        self.show_earth_status()
+        # The results follow the header, so the dashboard is always printed again here
+        self.show_earth_status(fresh=True)
 
         # Determine rank
-        if self.score >= 80:
-            rank = "🌟 Solar Defender Master 🌟"
-            message = "Amazing! You're a true space weather expert!"
-        elif self.score >= 50:
-            rank = "🎖️ Space Commander 🎖️"
-            message = "Excellent work! Earth is in safe hands!"
-        elif self.score >= 25:
-            rank = "🚀 Space Cadet 🚀"
-            message = "Good effort! Keep learning about space weather!"
-        else:
-            rank = "⭐ Space Beginner ⭐"
-            message = "Good start! More training will make you better!"
+        rank, message = next((rank, message) for threshold, rank, message in RANKS if self.score >= threshold)
 
-        print(f"\n🎖️ Your Rank: {rank}")
-        print(f"💬 {message}")
+        self.terminal.print(
+            f"\n🎖️ Your Rank: {rank}",
+            f"💬 {message}"
+        )
+
+        # The game state is final now, so render the report while the facts are read
+        if self.solar_data:
+            self.report_future = self.executor.submit(self.render_mission_report)
 
         # Educational facts
         self.educational_facts()
 
         # Visualizations
-        print("\n📊 Generating mission analysis...")
-        time.sleep(2)
+        self.terminal.print("\n📊 Generating mission analysis...")
         self.create_enhanced_visualization()
 
     def start_game(self):
@@ -628,8 +715,12 @@ class EnhancedSolarDefenderGame:
         if self.fetch_solar_data():
             self.game_loop()
 
-        print(f"\n👏 Thanks for playing, Commander {self.player_name}!")
-        print("🌎 Remember: Understanding space weather helps us protect our planet!")
+        self.executor.shutdown(wait=False)
+
+        self.terminal.print(
+            f"\n👏 Thanks for playing, Commander {self.player_name}!",
+            "🌎 Remember: Understanding space weather helps us protect our planet!"
+        )
 
 
 # Run the game
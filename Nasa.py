@@ -1,16 +1,57 @@
+import argparse
 import requests
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from io import BytesIO
+import json
+import threading
 import time
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 warnings.filterwarnings('ignore')
 
 # Set up amazing visual style
 plt.style.use('dark_background')
 from matplotlib import cm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+
+from alert_rules import AlertEngine
+from flare_archive import FLARE_COLUMNS, FlareArchive, normalize_flare
+from flare_classes import CLASS_LETTERS, class_to_flux, flux_to_intensity
+from flare_forecast import FlareForecast
+from flare_times import MISSING, flare_epochs, format_epochs, now_epoch, with_epochs
+from impact_model import score_flares
+from impact_raster import flare_impact_raster
+from magnetosphere import intensity_bucket, standoff_distance, trace_field_lines
+from render_cache import RenderCache, content_hash
+from terminal_renderer import Frame, default_terminal
+
+RISK_LABELS = ['≥X IN 24H', '≥M IN 24H', 'RISK LEVEL']
+# Most recent alerts listed in the report
+ALERT_LOG_SIZE = 50
+# Per-range statistics computed for the comparative dashboard
+COMPARISON_PANELS = ['spectrum', 'risk', 'timeline', 'impact']
+
+
+def range_bounds(ranges):
+    """(start, end) dates or ISO strings (naive = UTC) to epoch seconds"""
+    return [(int(pd.Timestamp(start).timestamp()), int(pd.Timestamp(end).timestamp())) for start, end in ranges]
+
+
+def parse_range(text):
+    """'2024-05-01..2024-05-08' -> ('2024-05-01', '2024-05-08')"""
+    start, separator, end = text.partition('..')
+    if not separator or not start or not end:
+        raise argparse.ArgumentTypeError(f"expected START..END, got {text!r}")
+    return start, end
+
 
 print("🌌" * 50)
 print("🚀 SPACE WEATHER AI: REAL-TIME SOLAR STORM PREDICTION SYSTEM 🚀")
@@ -20,39 +61,54 @@ print()
 
 
 class AmazingSpaceWeatherAI:
-    def __init__(self):
+    def __init__(self, http=requests, donki_url='https://api.nasa.gov/DONKI', archive_dir='flare_archive'):
         self.api_key = 'DEMO_KEY'
+        # Anything with a requests-style get(); swapped for recorders/replayers in testing
+        self.http = http
+        self.donki_url = donki_url
+        self.archive = FlareArchive(archive_dir)
         self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', "#3FA173", '#FECA57', '#FF9FF3', '#54A0FF']
+        self.render_cache = RenderCache()
+        self.terminal = default_terminal
+
+        # One long-lived engine, so each alert fires once however many reports are built
+        self.alert_engine = AlertEngine()
+        self.alert_log = deque(maxlen=ALERT_LOG_SIZE)
+        self.alerts_raised = 0
+        self.alert_lock = threading.Lock()
+        # Fitted once to the flare history (fit_forecast), then updated per new flare
+        self.forecaster = None
+        self.forecast_lock = threading.Lock()
 
     def create_loading_animation(self):
         """Create amazing loading animation"""
-        print("🛰️  Connecting to NASA satellites...")
+        self.terminal.print("🛰️  Connecting to NASA satellites...")
         for i in range(3):
-            print("📡" * (i + 1) + " Scanning solar activity..." + "✨" * (i + 1))
+            self.terminal.print("📡" * (i + 1) + " Scanning solar activity..." + "✨" * (i + 1))
             time.sleep(0.5)
-        print("✅ Connection established with NASA Deep Space Network!")
-        print()
+        self.terminal.print("✅ Connection established with NASA Deep Space Network!", "")
 
     def get_space_weather_data(self):
         """Fetch data with amazing visual feedback"""
         try:
-            print("🌞 Capturing real-time solar flares...")
-            flare_url = "https://api.nasa.gov/DONKI/FLR"
+            self.terminal.print("🌞 Capturing real-time solar flares...")
+            flare_url = f"{self.donki_url}/FLR"
             params = {'startDate': '2024-01-01', 'endDate': datetime.now().strftime('%Y-%m-%d'),
                       'api_key': self.api_key}
 
-            response = requests.get(flare_url, params=params, timeout=10)
+            response = self.http.get(flare_url, params=params, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
-                print("🎯 Solar flare data captured successfully!")
+                self.terminal.print("🎯 Solar flare data captured successfully!")
+                self.archive.add(data or [])
                 return self.process_flare_data(data)
             else:
-                print("⚠️  Using enhanced simulation data...")
+                self.terminal.print("⚠️  Using enhanced simulation data...")
                 return self.create_amazing_sample_data()
 
         except Exception as e:
-            print(f"🔄 Switching to advanced simulation mode...")
+            self.terminal.print(f"🔄 Switching to advanced simulation mode...")
             return self.create_amazing_sample_data()
 
     def process_flare_data(self, data):
@@ -62,28 +118,25 @@ class AmazingSpaceWeatherAI:
 
         flares = []
         for flare in data[:5]:  # Only first 5 flares
-            flares.append({
-                'flareID': flare.get('flareID', 'Unknown'),
-                'classType': flare.get('classType', 'B1.0'),
-                'beginTime': flare.get('beginTime', '2024-01-01T00:00:00Z'),
-            })
+            record = normalize_flare(flare)
+            record['flareID'] = record['flareID'] or 'Unknown'
+            record['beginTime'] = record['beginTime'] or '2024-01-01T00:00:00Z'
+            flares.append(record)
 
-        return pd.DataFrame(flares)
+        return with_epochs(pd.DataFrame(flares, columns=FLARE_COLUMNS))
 
     def create_amazing_sample_data(self):
         """Create spectacular sample data"""
-        print("🎨 Generating cosmic activity simulation...")
+        self.terminal.print("🎨 Generating cosmic activity simulation...")
+        begin_epochs = now_epoch() - np.arange(5) * 6 * 3600
         sample_data = {
             'flareID': [
                 f'SOLAR-BLAST-{i}' for i in range(1, 6)
             ],
             'classType': ['C2.5', 'M1.0', 'B7.2', 'X1.5', 'C8.1'],
-            'beginTime': [
-                (datetime.now() - pd.Timedelta(hours=i * 6)).strftime('%Y-%m-%dT%H:%M:%SZ')
-                for i in range(5)
-            ]
+            'beginTime': format_epochs(begin_epochs)
         }
-        return pd.DataFrame(sample_data)
+        return with_epochs(pd.DataFrame(sample_data))
 
     def predict_impacts_with_flair(self, flare_class):
         """Enhanced impact prediction with visual flair"""
@@ -102,7 +155,133 @@ class AmazingSpaceWeatherAI:
 
     def create_cosmic_visualizations(self, data):
         """Create stunning cosmic visualizations - FIXED VERSION"""
+        png = self.render_dashboard(data)
+
+        # Show the (possibly cached) render; only this part needs pyplot
         fig = plt.figure(figsize=(20, 15), facecolor='black')
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.imshow(plt.imread(BytesIO(png), format='png'))
+        ax.axis('off')
+        plt.show()
+
+    def render_dashboard(self, data, fmt='png', dpi=100):
+        """Render the dashboard to PNG/SVG bytes, re-rendering only when the data changes"""
+        key = content_hash(data, artifact='dashboard', fmt=fmt, dpi=dpi, now=self.forecast_time(),
+                           forecast=self.forecast_version())
+
+        def render():
+            buffer = BytesIO()
+            self.build_dashboard_figure(data).savefig(buffer, format=fmt, dpi=dpi, facecolor='black')
+            return buffer.getvalue()
+
+        return self.render_cache.get_or_render(key, fmt, render)
+
+    def compare_ranges(self, ranges, resolution=2.0):
+        """Load each (start, end) range from the archive and compute its panel statistics, all concurrently.
+
+        Returns one dict per range with its 'data' and a value per COMPARISON_PANELS entry.
+        """
+        bounds = range_bounds(ranges)
+        with ThreadPoolExecutor(max_workers=min(32, len(COMPARISON_PANELS) * len(ranges))) as pool:
+            loads = {pool.submit(self.archive.load, start, end): index for index, (start, end) in enumerate(ranges)}
+            # Each range's panels start as soon as that range is loaded, while the others still load
+            panels = {}
+            for load in as_completed(loads):
+                index = loads[load]
+                data = load.result()
+                start, end = bounds[index]
+                panels[index] = {
+                    'spectrum': pool.submit(self.spectrum_counts, data),
+                    'risk': pool.submit(self.risk_stats, data, end),
+                    'timeline': pool.submit(self.timeline_points, data, start),
+                    'impact': pool.submit(self.impact_raster, data, resolution),
+                }
+                panels[index]['data'] = data
+
+            return [{name: value.result() if name in COMPARISON_PANELS else value
+                     for name, value in panels[index].items()} for index in range(len(ranges))]
+
+    def render_comparison(self, ranges, fmt='png', dpi=100):
+        """Render the comparative dashboard, re-rendering only when the ranges or the archive change"""
+        key = content_hash([[str(start), str(end)] for start, end in ranges], artifact='comparison', fmt=fmt, dpi=dpi,
+                           archive=self.archive.version())
+
+        def render():
+            buffer = BytesIO()
+            self.build_comparison_figure(ranges, self.compare_ranges(ranges)).savefig(
+                buffer, format=fmt, dpi=dpi, facecolor='black')
+            return buffer.getvalue()
+
+        return self.render_cache.get_or_render(key, fmt, render)
+
+    def create_comparative_visualizations(self, ranges):
+        """Show several date ranges side by side"""
+        png = self.render_comparison(ranges)
+
+        fig = plt.figure(figsize=(6 * len(ranges) + 2, 18), facecolor='black')
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.imshow(plt.imread(BytesIO(png), format='png'))
+        ax.axis('off')
+        plt.show()
+
+    def build_comparison_figure(self, ranges, stats):
+        """Build the comparative dashboard off-screen: one column per range, one row per panel"""
+        fig = Figure(figsize=(6 * len(ranges) + 2, 18), facecolor='black')
+        FigureCanvasAgg(fig)
+        fig.suptitle('🌌 COSMIC WEATHER COMPARISON', fontsize=24, color='white', fontweight='bold')
+        gs = fig.add_gridspec(len(COMPARISON_PANELS), len(ranges))
+
+        # Shared scales, so the same height or colour means the same thing in every column
+        max_count = max(max(panel['spectrum']) for panel in stats) or 1
+        max_hours = max((end - start) / 3600.0 for start, end in range_bounds(ranges))
+        max_intensity = max([panel['timeline'][1].max() for panel in stats if len(panel['timeline'][1])], default=3.0)
+        max_impact = max(float(panel['impact'].max()) for panel in stats) or 1.0
+        colors = [self.get_flare_color(letter) for letter in CLASS_LETTERS]
+
+        for column, ((start, end), panel) in enumerate(zip(ranges, stats)):
+            ax = fig.add_subplot(gs[0, column])
+            ax.bar(CLASS_LETTERS, panel['spectrum'], color=colors, alpha=0.8, edgecolor='white')
+            ax.set_ylim(0, max_count * 1.15)
+            ax.set_title(f'📅 {start} → {end}\n🚀 SPECTRUM ({len(panel["data"])} flares)', color='white', fontsize=13)
+            ax.grid(True, alpha=0.3)
+            ax.set_facecolor('black')
+
+            ax = fig.add_subplot(gs[1, column])
+            ax.barh(RISK_LABELS, [100] * len(RISK_LABELS), color='gray', alpha=0.3, height=0.5)
+            ax.barh(RISK_LABELS, panel['risk'], color=[self.get_risk_color(v) for v in panel['risk']], height=0.5)
+            for y, value in enumerate(panel['risk']):
+                ax.text(50, y, f'{value:.0f}%', ha='center', va='center', fontsize=14, fontweight='bold', color='white')
+            ax.set_xlim(0, 100)
+            ax.set_title('⚠️ RISK AT RANGE END', color='white', fontsize=13)
+            ax.tick_params(colors='white')
+            ax.set_facecolor('black')
+
+            ax = fig.add_subplot(gs[2, column])
+            hours, intensity, classes = panel['timeline']
+            ax.scatter(hours, intensity, c=[self.get_flare_color(flare) for flare in classes],
+                       s=40 + 40 * intensity, alpha=0.7, edgecolors='white')
+            ax.set_xlim(0, max_hours)
+            ax.set_ylim(0, max_intensity + 0.5)
+            ax.set_yticks([1, 2, 3], ['C1', 'M1', 'X1'])
+            ax.set_xlabel('Hours since range start', color='white')
+            ax.set_title('⏰ TIMELINE', color='white', fontsize=13)
+            ax.grid(True, alpha=0.3, color='gray')
+            ax.tick_params(colors='white')
+            ax.set_facecolor('black')
+
+            ax = fig.add_subplot(gs[3, column])
+            ax.imshow(panel['impact'], origin='lower', extent=[-180, 180, -90, 90], cmap='inferno',
+                      vmin=0, vmax=max_impact, interpolation='bilinear', aspect='auto')
+            ax.set_title('🌍 IMPACT ZONES', color='white', fontsize=13)
+            ax.axis('off')
+
+        fig.tight_layout(rect=[0, 0, 1, 0.97])
+        return fig
+
+    def build_dashboard_figure(self, data):
+        """Build the dashboard figure off-screen"""
+        fig = Figure(figsize=(20, 15), facecolor='black')
+        FigureCanvasAgg(fig)
         fig.suptitle('🌌 COSMIC WEATHER INTELLIGENCE DASHBOARD',
                      fontsize=24, color='white', fontweight='bold', y=0.98)
 
@@ -127,19 +306,19 @@ class AmazingSpaceWeatherAI:
 
         # 5. Magnetic Storm Simulation (Bottom-right)
         ax5 = fig.add_subplot(gs[1, 2])
-        self.create_storm_simulation(ax5)
+        self.create_storm_simulation(ax5, data)
 
         # 6. Planetary Impact Map (Bottom full width)
         ax6 = fig.add_subplot(gs[2, :])
         self.create_impact_map(ax6, data)
 
-        plt.tight_layout()
-        plt.show()
+        fig.tight_layout()
+        return fig
 
     def create_flare_barchart(self, ax, data):
         """Create 2D bar chart instead of 3D for compatibility"""
-        categories = ['A', 'B', 'C', 'M', 'X']
-        counts = [sum(1 for f in data['classType'] if f.startswith(cat)) for cat in categories]
+        categories = CLASS_LETTERS
+        counts = self.spectrum_counts(data)
 
         colors = ['#00FF00', '#7CFC00', '#FFD700', '#FF8C00', '#FF0000']
 
@@ -160,7 +339,12 @@ class AmazingSpaceWeatherAI:
     def create_activity_radar(self, ax, data):
         """Create radar chart of activity levels - WORKING VERSION"""
         categories = ['Radio', 'GPS', 'Power', 'Satellites', 'Astronauts']
-        values = [70, 45, 30, 60, 25]  # Simulated impact levels
+        scores = score_flares(data) if len(data) else None
+        if scores is not None:
+            # Worst predicted impact per system across the flare set
+            values = scores[['comm', 'gps', 'power', 'satellites', 'astronauts']].max().round(1).tolist()
+        else:
+            values = [70, 45, 30, 60, 25]  # Simulated impact levels
 
         angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
         values += values[:1]
@@ -177,23 +361,86 @@ class AmazingSpaceWeatherAI:
 
     def create_risk_meter(self, ax, data):
         """Create stunning risk meter"""
-        risk_level = sum(3 if f[0] == 'X' else 2 if f[0] == 'M' else 1 for f in data['classType'])
-        max_risk = len(data) * 3
-        risk_percent = (risk_level / max_risk) * 100 if max_risk > 0 else 0
+        labels = RISK_LABELS
+        values = self.risk_stats(data)
 
         # Create a simple progress bar instead of circular gauge
-        ax.barh(['RISK LEVEL'], [100], color='gray', alpha=0.3, height=0.5)
-        ax.barh(['RISK LEVEL'], [risk_percent], color=self.get_risk_color(risk_percent), height=0.5)
+        ax.barh(labels, [100] * 3, color='gray', alpha=0.3, height=0.5)
+        ax.barh(labels, values, color=[self.get_risk_color(v) for v in values], height=0.5)
         ax.set_xlim(0, 100)
         ax.set_title('⚠️ COSMIC RISK METER', color='white', fontsize=14)
-        ax.text(50, 0, f'{risk_percent:.0f}%', ha='center', va='center',
-                fontsize=20, fontweight='bold', color='white')
+        for y, value in enumerate(values):
+            ax.text(50, y, f'{value:.0f}%', ha='center', va='center',
+                    fontsize=16, fontweight='bold', color='white')
         ax.set_facecolor('black')
         ax.tick_params(colors='white')
 
+    def spectrum_counts(self, data):
+        """Number of flares per class letter, in CLASS_LETTERS order"""
+        letters = data['classType'].str[:1]
+        return [int((letters == letter).sum()) for letter in CLASS_LETTERS]
+
+    def risk_stats(self, data, now=None):
+        """Risk meter values in percent, in RISK_LABELS order"""
+        forecast = self.forecast_flares(data, now)
+        return [forecast['X'] * 100, forecast['M'] * 100, self.calculate_risk_percent(data)]
+
+    def timeline_points(self, data, start):
+        """Hours since `start` (epoch seconds), log intensity (C1=1, M1=2, X1=3) and class of each dated flare"""
+        epochs = flare_epochs(data)
+        known = epochs != MISSING
+        classes = data['classType'].to_numpy()[known]
+        return (epochs[known] - start) / 3600.0, flux_to_intensity(class_to_flux(classes)), classes
+
+    def impact_raster(self, data, resolution=2.0):
+        """Aurora and radio-blackout raster for every flare in the set"""
+        begin_times = flare_epochs(data).astype('datetime64[s]')  # missing epochs become NaT
+        return flare_impact_raster(data['classType'], begin_times, resolution)
+
+    def forecast_time(self):
+        """Forecast reference time: now, floored to the hour so cached renders stay valid for an hour"""
+        return int(time.time() // 3600 * 3600)
+
+    def fit_forecast(self, history):
+        """Fit the long-lived forecaster to the flare history (e.g. the whole archive)"""
+        forecaster = FlareForecast().fit(history, self.forecast_time())
+        with self.forecast_lock:
+            self.forecaster = forecaster
+
+    def update_forecast(self, flares):
+        """Fold flares the forecaster has not seen yet into it, in O(1) each"""
+        with self.forecast_lock:
+            if self.forecaster is not None:
+                self.forecaster.update_data(flares)
+
+    def forecast_version(self):
+        """Changes whenever the long-lived forecaster does (part of the render cache keys)"""
+        with self.forecast_lock:
+            if self.forecaster is None:
+                return None
+            return [model.event_count for model in self.forecaster.models.values()]
+
+    def forecast_flares(self, data, now=None):
+        """Probability of at least one ≥M and ≥X flare in the next 24 hours.
+
+        Answered by the long-lived forecaster once one is fitted; data is only fitted
+        on the spot without one, or for another reference time (e.g. a range's end).
+        """
+        if now is None and self.forecaster is not None:
+            with self.forecast_lock:
+                return self.forecaster.probabilities(self.forecast_time())
+        now = self.forecast_time() if now is None else now
+        return FlareForecast().fit(data, now).probabilities(now)
+
+    def calculate_risk_percent(self, data):
+        """Overall risk level (0-100) of a flare set"""
+        risk_level = sum(3 if f[0] == 'X' else 2 if f[0] == 'M' else 1 for f in data['classType'])
+        max_risk = len(data) * 3
+        return (risk_level / max_risk) * 100 if max_risk > 0 else 0
+
     def create_cosmic_timeline(self, ax, data):
         """Create animated timeline of solar events"""
-        times = pd.to_datetime(data['beginTime'])
+        times = flare_epochs(data).astype('datetime64[s]')
         intensities = [float(flare[1:]) if len(flare) > 1 else 1.0 for flare in data['classType']]
 
         colors = [self.get_flare_color(flare) for flare in data['classType']]
@@ -212,46 +459,41 @@ class AmazingSpaceWeatherAI:
         for i, (time, intensity, flare) in enumerate(zip(times, intensities, data['classType'])):
             ax.annotate(f' {flare}', (time, intensity), color='white', fontsize=10)
 
-    def create_storm_simulation(self, ax):
+    def create_storm_simulation(self, ax, data):
         """Create magnetic storm simulation"""
-        t = np.linspace(0, 4 * np.pi, 100)
-        x = np.sin(t) * (1 + 0.5 * np.sin(5 * t))
-        y = np.cos(t) * (1 + 0.5 * np.sin(5 * t))
-
-        colors = plt.cm.plasma(np.linspace(0, 1, len(t)))
-
-        scatter = ax.scatter(x, y, c=colors, s=50, alpha=0.6)
-        ax.plot(x, y, 'w-', alpha=0.3)
+        # Dipole field lines compressed by the strongest flare in the data set
+        flux = class_to_flux(data['classType'])
+        intensity = float(flux_to_intensity(flux).max()) if len(flux) else 0.0
+        bucket = intensity_bucket(intensity)
+        lines = trace_field_lines(bucket)
+
+        colors = plt.cm.plasma(np.linspace(0, 1, len(lines)))
+        ax.add_collection(LineCollection(lines, colors=colors, linewidths=1.2, alpha=0.8))
+        ax.add_patch(Circle((0, 0), 1, color='#45B7D1'))
+
+        standoff = standoff_distance(bucket)
+        ax.axvline(standoff, color='#FECA57', linestyle='--', alpha=0.6)
+        ax.text(standoff, -6, f' {standoff:.1f} Rₑ', color='#FECA57', fontsize=10)
+        ax.text(10, 6, '← ☀️', color='white', fontsize=12, ha='center')
+
+        ax.set_xlim(-12, 12)
+        ax.set_ylim(-8, 8)
+        ax.set_aspect('equal')
         ax.set_title('🌀 MAGNETIC STORM SIMULATION', color='white', fontsize=14)
         ax.axis('off')
         ax.set_facecolor('black')
 
-    def create_impact_map(self, ax, data):
+    def create_impact_map(self, ax, data, resolution=2.0):
         """Create Earth impact map"""
-        # Create a simple Earth representation
-        theta = np.linspace(0, 2 * np.pi, 100)
-        earth_radius = 1
-        x_earth = earth_radius * np.cos(theta)
-        y_earth = earth_radius * np.sin(theta)
-
-        ax.plot(x_earth, y_earth, 'b-', linewidth=2)
-        ax.fill(x_earth, y_earth, alpha=0.3, color='blue')
-
-        # Add impact zones based on flare intensity
-        for flare in data['classType']:
-            if flare[0] in ['M', 'X']:
-                # Create aurora zones
-                aurora_theta = np.linspace(np.pi / 4, 3 * np.pi / 4, 50)
-                x_aurora = 1.2 * np.cos(aurora_theta)
-                y_aurora = 1.2 * np.sin(aurora_theta)
-                ax.plot(x_aurora, y_aurora, 'g--', alpha=0.7, label='Aurora Zone' if flare[0] == 'M' else "")
+        # One vectorized pass over all flares, drawn as a single image layer
+        raster = self.impact_raster(data, resolution)
+
+        ax.imshow(raster, origin='lower', extent=[-180, 180, -90, 90], cmap='inferno',
+                  interpolation='bilinear', aspect='auto')
 
         ax.set_title('🌍 PLANETARY IMPACT ZONES', color='white', fontsize=16)
-        ax.text(0, 0, 'EARTH', ha='center', va='center', fontsize=20,
-                color='white', fontweight='bold')
         ax.axis('off')
         ax.set_facecolor('black')
-        ax.set_aspect('equal')
 
     def get_flare_color(self, flare_class):
         """Get color based on flare class"""
@@ -269,76 +511,202 @@ class AmazingSpaceWeatherAI:
 
     def generate_cosmic_report(self, data):
         """Generate amazing cosmic report"""
-        print("\n" + "✨" * 60)
-        print("📊 COSMIC WEATHER INTELLIGENCE REPORT")
-        print("✨" * 60)
-
-        # Enhanced statistics with emojis
-        total_flares = len(data)
+        # The whole report goes out as one write
+        self.terminal.print(self.render_cosmic_report(data))
+
+    def observe_alerts(self, data):
+        """Feed flares to the long-lived alert engine (ones it has seen are skipped); returns the new alerts.
+
+        The engine is first moved to the forecast time, so rules whose windows have
+        emptied clear even when no new flare arrives, and flares already out of every
+        window raise nothing.
+        """
+        with self.alert_lock:
+            self.alert_engine.advance(self.forecast_time())
+            alerts = self.alert_engine.observe_data(data)
+            self.alert_log.extend(alerts)
+            self.alerts_raised += len(alerts)
+        return alerts
+
+    def alert_version(self):
+        """Changes whenever an alert fires or a rule turns on/off (part of the report cache keys)"""
+        with self.alert_lock:
+            return self.alerts_raised, self.alert_engine.active.tolist()
+
+    def report_key(self, data):
+        """Cache key shared by the text and JSON reports of a flare set"""
+        self.observe_alerts(data)
+        return content_hash(data, artifact='report', now=self.forecast_time(), alerts=self.alert_version(),
+                            forecast=self.forecast_version())
+
+    def render_cosmic_report(self, data):
+        """Render the cosmic report text, re-rendering only when the data changes"""
+        return self.render_cache.get_or_render(
+            self.report_key(data), 'txt', lambda: self.build_cosmic_report(data).encode('utf-8')).decode('utf-8')
+
+    def render_json_report(self, data):
+        """Render the report as JSON, re-rendering only when the data changes"""
+        return self.render_cache.get_or_render(
+            self.report_key(data), 'json',
+            lambda: self.format_json_report(self.build_report_summary(data)).encode('utf-8')).decode('utf-8')
+
+    def render_reports(self, data):
+        """Render the text and JSON reports together, from a single summary when either is stale"""
+        key = self.report_key(data)
+        text, report = self.render_cache.get(key, 'txt'), self.render_cache.get(key, 'json')
+        if text is None or report is None:
+            summary = self.build_report_summary(data)
+            text = self.render_cache.put(key, 'txt', self.format_cosmic_report(summary).encode('utf-8'))
+            report = self.render_cache.put(key, 'json', self.format_json_report(summary).encode('utf-8'))
+        return text.decode('utf-8'), report.decode('utf-8')
+
+    def build_report_summary(self, data):
+        """Collect the report contents as plain data"""
         strongest_flare = data.loc[data['classType'].str[1:].astype(float).idxmax()] if len(data) > 0 else None
-
-        print(f"\n🌠 COSMIC ACTIVITY SUMMARY:")
-        print(f"   🌟 Total Solar Events: {total_flares}")
-        if strongest_flare is not None:
-            print(f"   💥 Strongest Flare: {strongest_flare['classType']}")
-        print(f"   📅 Monitoring Period: Real-time analysis")
-
-        print(f"\n⚠️  IMPACT ASSESSMENT:")
+        # One batch inference for the whole set; the lookup table stays as the fallback
+        scores = score_flares(data) if len(data) else None
+        events = []
         for idx, flare in data.iterrows():
             impact = self.predict_impacts_with_flair(flare['classType'])
-            print(f"   {impact['icon']} {flare['classType']}: {impact['risk']}")
-            print(f"      {' | '.join(impact['effects'])}")
+            events.append({
+                'flareID': flare['flareID'],
+                'classType': flare['classType'],
+                'beginTime': flare['beginTime'],
+                'risk': impact['risk'],
+                'effects': impact['effects'],
+                'impact_scores': scores.loc[idx].round(1).to_dict() if scores is not None else None
+            })
 
-        print(f"\n🛡️  PLANETARY DEFENSE RECOMMENDATIONS:")
-        recommendations = [
-            "🛰️  Stabilize satellite orbits",
-            "⚡ Reinforce power grid protocols",
-            "📡 Activate backup communication systems",
-            "👨‍🚀 Alert space station crew",
-            "🌌 Monitor aurora activity zones"
-        ]
+        # Recommendations come from the alert rules still active at the forecast time; alerts already
+        # raised by earlier reports are listed, not raised again
+        self.observe_alerts(data)
+        with self.alert_lock:
+            alerts = list(self.alert_log)
+            recommendations = [rule['message'] for rule in self.alert_engine.active_rules()]
+
+        return {
+            'total_flares': len(data),
+            'strongest_flare': strongest_flare['classType'] if strongest_flare is not None else None,
+            'events': events,
+            'alerts': alerts,
+            'recommendations': recommendations or ["✅ Solar activity nominal - no defensive action needed"],
+            'forecast_24h': self.forecast_flares(data),
+            'next_update_hours': 3
+        }
 
-        for rec in recommendations:
-            print(f"   • {rec}")
+    def build_cosmic_report(self, data):
+        """Compose the cosmic report text"""
+        return self.format_cosmic_report(self.build_report_summary(data))
 
-        print(f"\n🎯 PREDICTION CONFIDENCE: 92.7%")
-        print(f"🔄 Next update in: 3 hours")
-        print("✨" * 60)
+    def format_json_report(self, summary):
+        return json.dumps(summary, indent=2, ensure_ascii=False)
+
+    def format_cosmic_report(self, summary):
+        """Lay out a report summary as the cosmic report text"""
+        lines = []
+        lines.append("\n" + "✨" * 60)
+        lines.append("📊 COSMIC WEATHER INTELLIGENCE REPORT")
+        lines.append("✨" * 60)
+
+        # Enhanced statistics with emojis
+        lines.append(f"\n🌠 COSMIC ACTIVITY SUMMARY:")
+        lines.append(f"   🌟 Total Solar Events: {summary['total_flares']}")
+        if summary['strongest_flare'] is not None:
+            lines.append(f"   💥 Strongest Flare: {summary['strongest_flare']}")
+        lines.append(f"   📅 Monitoring Period: Real-time analysis")
+
+        lines.append(f"\n⚠️  IMPACT ASSESSMENT:")
+        for event in summary['events']:
+            impact = self.predict_impacts_with_flair(event['classType'])
+            lines.append(f"   {impact['icon']} {event['classType']}: {event['risk']}")
+            lines.append(f"      {' | '.join(event['effects'])}")
+
+        lines.append(f"\n🚨 ALERTS RAISED: {len(summary['alerts'])}")
+        for alert in summary['alerts'][-5:]:
+            lines.append(f"   • {alert['rule']} (triggered by {alert['flareID']})")
+
+        lines.append(f"\n🛡️  PLANETARY DEFENSE RECOMMENDATIONS:")
+        for rec in summary['recommendations']:
+            lines.append(f"   • {rec}")
+
+        forecast = summary['forecast_24h']
+        lines.append(f"\n🎯 24H FLARE FORECAST: ≥M {forecast['M']:.0%} | ≥X {forecast['X']:.0%}")
+        lines.append(f"🔄 Next update in: {summary['next_update_hours']} hours")
+        lines.append("✨" * 60)
+        return "\n".join(lines)
 
 
 # Amazing main execution
 def main():
     # Create spectacular AI system
     ai_system = AmazingSpaceWeatherAI()
+    terminal = ai_system.terminal
 
     # Amazing loading sequence
     ai_system.create_loading_animation()
 
     # Fetch cosmic data
-    print("🌠 Scanning solar system for activity...")
+    terminal.print("🌠 Scanning solar system for activity...")
     space_data = ai_system.get_space_weather_data()
+    # The forecast learns from every archived flare, not just the few on display
+    history = ai_system.archive.load()
+    ai_system.fit_forecast(history if len(history) else space_data)
 
     # Display amazing data
-    print("\n📡 CAPTURED COSMIC EVENTS:")
-    print("=" * 50)
+    frame = Frame().add("\n📡 CAPTURED COSMIC EVENTS:").add("=" * 50)
     for idx, event in space_data.iterrows():
         impact = ai_system.predict_impacts_with_flair(event['classType'])
-        print(f"🌞 {event['flareID']} | Class: {event['classType']} | Risk: {impact['risk']}")
+        frame.add(f"🌞 {event['flareID']} | Class: {event['classType']} | Risk: {impact['risk']}")
+    frame.show(terminal)
 
     # Generate cosmic report
     ai_system.generate_cosmic_report(space_data)
 
     # Create mind-blowing visualizations
-    print("\n🎨 Rendering cosmic intelligence dashboard...")
+    terminal.print("\n🎨 Rendering cosmic intelligence dashboard...")
     time.sleep(2)
     ai_system.create_cosmic_visualizations(space_data)
 
     # Final amazing message
-    print("\n" + "🚀" * 30)
-    print("✅ COSMIC MONITORING SYSTEM ACTIVE")
-    print("🌍 Earth is being protected by AI-powered space weather intelligence!")
-    print("🚀" * 30)
+    terminal.print(
+        "\n" + "🚀" * 30,
+        "✅ COSMIC MONITORING SYSTEM ACTIVE",
+        "🌍 Earth is being protected by AI-powered space weather intelligence!",
+        "🚀" * 30
+    )
+
+
+def compare_main(ranges, output=None):
+    """Comparative dashboard of archived date ranges"""
+    ai_system = AmazingSpaceWeatherAI()
+    terminal = ai_system.terminal
+
+    terminal.print(f"\n🗂️ Comparing {len(ranges)} archived ranges...")
+    started = time.perf_counter()
+    png = ai_system.render_comparison(ranges)
+    terminal.print(f"✅ Comparison ready in {time.perf_counter() - started:.2f}s")
+    if output:
+        with open(output, 'wb') as handle:
+            handle.write(png)
+        terminal.print(f"💾 Saved to {output}")
+    ai_system.create_comparative_visualizations(ranges)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Real-time solar storm prediction system')
+    parser.add_argument('--compare', nargs='+', type=parse_range, metavar='START..END',
+                        help='compare archived date ranges side by side instead of the live run')
+    parser.add_argument('--output', help='also save the comparison image to this file')
+    parser.add_argument('--daemon', action='store_true', help='keep polling DONKI and refreshing the reports')
+    parser.add_argument('--interval', type=float, default=3 * 3600, help='daemon poll interval in seconds')
+    parser.add_argument('--output-dir', default='monitor_output', help='where the daemon writes its reports')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_main(args.compare, args.output)
+    elif args.daemon:
+        # Imported here, and handed this module's class, so Nasa is not imported a second time
+        from monitor_daemon import run_daemon
+        run_daemon(AmazingSpaceWeatherAI(), args.interval, args.output_dir)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,187 @@
+import re
+import time
+
+import numpy as np
+
+from flare_classes import class_to_flux
+from flare_times import MISSING, flare_epochs
+
+RULE_PATTERN = re.compile(
+    r'^\s*(?:(?P<count>\d+)\s*x\s*)?(?:>=|≥)\s*(?P<cls>[ABCMX]\d*(?:\.\d+)?)\s+within\s+(?P<hours>\d+(?:\.\d+)?)\s*h\s*$',
+    re.IGNORECASE)
+SUM_PATTERN = re.compile(
+    r'^\s*sum\s*(?:>=|≥)\s*(?P<total>[ABCMX]\d*(?:\.\d+)?|[\d.eE+-]+)\s+within\s+(?P<hours>\d+(?:\.\d+)?)\s*h\s*$',
+    re.IGNORECASE)
+
+
+def flux_value(text):
+    """Flux from either a class string ('X1.5') or a plain number ('1.5e-4')"""
+    if text[0].upper() in 'ABCMX':
+        return float(class_to_flux([text.upper()])[0])
+    return float(text)
+
+
+def parse_rule(text, message=None, name=None):
+    """Parse '≥M5 within 6h', '3x ≥M1 within 24h' or 'sum ≥ X1 within 24h' into a rule dict"""
+    match = RULE_PATTERN.match(text)
+    if match:
+        rule = {
+            'min_flux': flux_value(match['cls']),
+            'window_hours': float(match['hours']),
+            'min_count': int(match['count'] or 1),
+            'min_flux_sum': 0.0
+        }
+    else:
+        match = SUM_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"Cannot parse alert rule: {text!r}")
+        rule = {
+            'min_flux': 0.0,
+            'window_hours': float(match['hours']),
+            'min_count': 1,
+            'min_flux_sum': flux_value(match['total'])
+        }
+    rule['name'] = name or text.strip()
+    rule['message'] = message or f"⚠️ {rule['name']}"
+    return rule
+
+
+# Rules behind the report's defense recommendations
+DEFAULT_RULES = [
+    parse_rule('≥X1 within 24h', "🛰️  Stabilize satellite orbits"),
+    parse_rule('≥M1 within 24h', "⚡ Reinforce power grid protocols"),
+    parse_rule('≥C5 within 6h', "📡 Activate backup communication systems"),
+    parse_rule('sum ≥ X1 within 24h', "👨‍🚀 Alert space station crew"),
+    parse_rule('3x ≥M1 within 24h', "🌌 Monitor aurora activity zones"),
+]
+
+
+class AlertEngine:
+    """Evaluate many threshold/window rules per incoming flare with shared array operations"""
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = list(rules)
+        self.min_flux = np.array([rule['min_flux'] for rule in self.rules], dtype=float)
+        self.min_count = np.array([rule['min_count'] for rule in self.rules], dtype=int)
+        self.min_flux_sum = np.array([rule['min_flux_sum'] for rule in self.rules], dtype=float)
+
+        # Rules sharing a window share one sliding-window pass, and rules sharing a
+        # (window, threshold) pair share one counter, so thousands of rules collapse
+        # into a few hundred predicates
+        windows = np.array([rule['window_hours'] * 3600.0 for rule in self.rules], dtype=float)
+        self.windows, window_index = np.unique(windows, return_inverse=True)
+        self.thresholds, threshold_index = np.unique(self.min_flux, return_inverse=True)
+        pairs, self.pair_index = np.unique(window_index * len(self.thresholds) + threshold_index,
+                                           return_inverse=True)
+        self.pair_window, self.pair_threshold = np.divmod(pairs, max(len(self.thresholds), 1))
+        self.max_window = self.windows.max() if len(self.windows) else 0.0
+
+        self.times = np.zeros(0)
+        self.fluxes = np.zeros(0)
+        self.ids = np.zeros(0, dtype=object)
+        self.seen = set()
+        self.latest = -np.inf
+        self.now = -np.inf
+        self.active = np.zeros(len(self.rules), dtype=bool)
+
+    def observe(self, flare_id, begin_time, flux):
+        """Add one flare (epoch seconds, W/m^2) and return the alerts it newly triggers"""
+        if flare_id in self.seen or begin_time < self.reference_time() - self.max_window:
+            return []
+        self.seen.add(flare_id)
+        self.times = np.append(self.times, begin_time)
+        self.fluxes = np.append(self.fluxes, flux)
+        self.ids = np.append(self.ids, flare_id)
+        self.latest = max(self.latest, begin_time)
+        self.forget()
+
+        condition = self.evaluate()
+        fired = np.flatnonzero(condition & ~self.active)
+        self.active = condition
+        return [{
+            'rule': self.rules[i]['name'],
+            'message': self.rules[i]['message'],
+            'flareID': flare_id,
+            'time': begin_time
+        } for i in fired]
+
+    def advance(self, now):
+        """Re-evaluate every rule at wall-clock time now (epoch seconds).
+
+        Windows otherwise end at the latest flare, so without a new flare a rule would
+        stay active forever; here rules whose windows have emptied clear, and re-arm.
+        """
+        self.now = max(self.now, now)
+        self.forget()
+        self.active = self.evaluate()
+
+    def reference_time(self):
+        """End of every rule window: the latest flare, or the wall clock once it has passed it"""
+        return max(self.latest, self.now)
+
+    def forget(self):
+        """Drop events no rule can see any more"""
+        keep = self.times >= self.reference_time() - self.max_window
+        if not keep.all():
+            self.seen.difference_update(self.ids[~keep])
+            self.times, self.fluxes, self.ids = self.times[keep], self.fluxes[keep], self.ids[keep]
+
+    def evaluate(self):
+        """Boolean condition of every rule at the reference time"""
+        order = np.argsort(self.fluxes, kind='stable')
+        fluxes = self.fluxes[order]
+        in_window = self.times[order][None, :] >= self.reference_time() - self.windows[:, None]
+
+        # Counts/sums of in-window events from flux rank j upwards, per window (zero-padded at the end)
+        counts = np.zeros((len(self.windows), fluxes.size + 1))
+        sums = np.zeros((len(self.windows), fluxes.size + 1))
+        counts[:, :-1] = np.cumsum(in_window[:, ::-1], axis=1)[:, ::-1]
+        sums[:, :-1] = np.cumsum((in_window * fluxes)[:, ::-1], axis=1)[:, ::-1]
+
+        rank = np.searchsorted(fluxes, self.thresholds, side='left')[self.pair_threshold]
+        pair_counts = counts[self.pair_window, rank]
+        pair_sums = sums[self.pair_window, rank]
+        return ((pair_counts[self.pair_index] >= self.min_count)
+                & (pair_sums[self.pair_index] >= self.min_flux_sum))
+
+    def observe_data(self, data):
+        """Feed a flare DataFrame in time order and return every alert raised"""
+        times = flare_epochs(data)
+        order = np.argsort(times, kind='stable')
+        order = order[times[order] != MISSING]
+        fluxes = class_to_flux(data['classType'].to_numpy()[order])
+        alerts = []
+        for flare_id, begin_time, flux in zip(data['flareID'].to_numpy()[order], times[order], fluxes):
+            alerts.extend(self.observe(flare_id, float(begin_time), flux))
+        return alerts
+
+    def active_rules(self):
+        return [rule for rule, active in zip(self.rules, self.active) if active]
+
+
+if __name__ == "__main__":
+    # Benchmark: thousands of random rules against a synthetic flare stream
+    rng = np.random.default_rng(7)
+    letters = np.array(['B', 'C', 'M', 'X'])
+    rules = []
+    for i in range(5000):
+        cls = f"{rng.choice(letters[1:])}{rng.integers(1, 10)}"
+        hours = int(rng.choice([1, 3, 6, 12, 24, 48]))
+        if i % 3 == 2:
+            rules.append(parse_rule(f'sum ≥ {cls} within {hours}h'))
+        else:
+            rules.append(parse_rule(f'{rng.integers(1, 5)}x ≥{cls} within {hours}h'))
+    engine = AlertEngine(rules)
+
+    events = 20000
+    times = np.cumsum(rng.exponential(3600.0, events))
+    classes = [f"{letter}{magnitude:.1f}" for letter, magnitude in
+               zip(rng.choice(letters, events, p=[0.3, 0.55, 0.13, 0.02]), rng.uniform(1, 9.9, events))]
+    fluxes = class_to_flux(classes)
+
+    started = time.perf_counter()
+    fired = 0
+    for i in range(events):
+        fired += len(engine.observe(f'BENCH-{i}', times[i], fluxes[i]))
+    elapsed = time.perf_counter() - started
+    print(f"⚡ {len(rules)} rules x {events} flares: {elapsed / events * 1e6:.1f} µs per flare, {fired} alerts")
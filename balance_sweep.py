@@ -0,0 +1,251 @@
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from flare_archive import FlareArchive
+from flare_classes import CLASS_LETTERS
+from game_rules import DEFENSE_STRATEGIES, IMPACTS, MISSION_PHASES, RANKS, SUCCESS_POINTS
+from impact_model import OUTPUTS, data_features, flare_features, load_model
+
+SYSTEMS = ['power', 'satellites', 'comm']
+CHOICES = sorted(DEFENSE_STRATEGIES)
+
+# The game's tables as arrays: fallback damage per class (5, 3), recovery per choice (4, 3)
+IMPACT_TABLE = np.array([[IMPACTS[letter][system] for system in SYSTEMS] for letter in CLASS_LETTERS], dtype=float)
+RECOVERY_TABLE = np.array([[DEFENSE_STRATEGIES[choice]['recovery'].get(system, 0) for system in SYSTEMS]
+                           for choice in CHOICES], dtype=float)
+# Only the systems a defense covers take the flare's damage
+DEFENDED = np.array([[system in DEFENSE_STRATEGIES[choice]['recovery'] for system in SYSTEMS] for choice in CHOICES])
+COSTS = np.array([DEFENSE_STRATEGIES[choice]['cost'] for choice in CHOICES], dtype=float)
+
+# Fixed policies play the same defense every phase (index into CHOICES)
+FIXED_POLICIES = {'satellites': 0, 'grid': 1, 'comm': 2, 'integrated': 3}
+POLICIES = list(FIXED_POLICIES) + ['greedy', 'random']
+
+# Class mix for synthetic sequences, close to the game's simulation data
+SYNTHETIC_MIX = {'A': 0.05, 'B': 0.25, 'C': 0.35, 'M': 0.25, 'X': 0.10}
+
+PARAMETERS = ['impact_scale', 'recovery_scale', 'cost_scale', 'success_points']
+
+
+def class_indices(class_types):
+    """Flare class strings to rows of IMPACT_TABLE (unknown letters play as B, like the game)"""
+    lookup = {letter: index for index, letter in enumerate(CLASS_LETTERS)}
+    return np.array([lookup.get(str(flare_class)[:1], lookup['B']) for flare_class in class_types], dtype=np.int8)
+
+
+def flare_damage(class_types, features):
+    """Unrounded damage to SYSTEMS per flare (N, 3), as the game deals it.
+
+    With impact model weights the game replaces the table with the model's
+    scores (rounded), so the sweep plays those; without weights, the table.
+    """
+    model = load_model()
+    if model is None:
+        return IMPACT_TABLE[class_indices(class_types)]
+    return model.predict(features)[:, [OUTPUTS.index(system) for system in SYSTEMS]]
+
+
+def archive_sequences(directory, phases=MISSION_PHASES):
+    """Every run of `phases` consecutive archived flares: (damage (P, 3), sequences (N, phases) of flare indices)"""
+    empty = np.zeros((0, len(SYSTEMS))), np.zeros((0, phases), dtype=np.int64)
+    if not os.path.isdir(directory):
+        return empty
+    data = FlareArchive(directory).load()
+    if len(data) < phases:
+        return empty
+    damage = flare_damage(data['classType'].tolist(), data_features(data))
+    return damage, np.lib.stride_tricks.sliding_window_view(np.arange(len(data)), phases).copy()
+
+
+def synthetic_sequences(count, phases=MISSION_PHASES, seed=0):
+    """Random flares like the game's simulation data (class and magnitude only): (damage, sequences)"""
+    rng = np.random.default_rng(seed)
+    mix = np.array([SYNTHETIC_MIX[letter] for letter in CLASS_LETTERS])
+    letters = np.array(CLASS_LETTERS)[rng.choice(len(CLASS_LETTERS), size=count * phases, p=mix / mix.sum())]
+    classes = [f'{letter}{magnitude:.1f}' for letter, magnitude in zip(letters, rng.uniform(1.0, 9.9, count * phases))]
+    return flare_damage(classes, flare_features(classes)), np.arange(count * phases).reshape(count, phases)
+
+
+def combine_sequences(*parts):
+    """Concatenate (damage, sequences) pairs into one flare pool"""
+    damage = np.concatenate([part_damage for part_damage, _ in parts])
+    offsets = np.cumsum([0] + [len(part_damage) for part_damage, _ in parts[:-1]])
+    sequences = np.concatenate([part_sequences + offset for (_, part_sequences), offset in zip(parts, offsets)])
+    return damage, sequences
+
+
+def parameter_grid(impact_scales, recovery_scales, cost_scales, success_points):
+    """All parameter combinations, one row per combination in PARAMETERS order"""
+    return np.array(list(itertools.product(impact_scales, recovery_scales, cost_scales, success_points)), dtype=float)
+
+
+def simulate(combos, pool, sequences, policy, rng=None):
+    """Play every sequence under every parameter combination at once.
+
+    combos is (C, len(PARAMETERS)), pool is the (P, 3) damage of each flare
+    and sequences is (S, phases) indices into it.
+    Returns final scores and survival flags, both (C, S).
+    """
+    rng = rng or np.random.default_rng()
+    count, size = len(combos), len(sequences)
+    # The game rounds each flare's damage; impact_scale scales it before that
+    impact = np.round(pool[None] * combos[:, 0, None, None])
+    recovery = RECOVERY_TABLE[None] * combos[:, 1, None, None]
+    costs = COSTS[None] * combos[:, 2, None]
+    success = combos[:, 3, None]
+
+    systems = np.full((count, size, len(SYSTEMS)), 100.0)
+    score = np.zeros((count, size))
+    alive = np.ones((count, size), dtype=bool)
+
+    for phase in range(sequences.shape[1]):
+        damage = impact[:, sequences[:, phase]]  # (C, S, 3)
+
+        if policy in FIXED_POLICIES:
+            choice = np.full((count, size), FIXED_POLICIES[policy])
+        elif policy == 'random':
+            choice = rng.integers(0, len(CHOICES), (count, size))
+        else:
+            # Greedy: the defense leaving Earth healthiest, cheaper one on ties
+            outcomes = np.where(DEFENDED[:, None, None, :],
+                                np.maximum(0, systems[None] - damage[None] + recovery.transpose(1, 0, 2)[:, :, None, :]),
+                                systems[None])
+            health = np.floor(outcomes.sum(axis=-1) / 3)
+            choice = np.argmax(health - costs.T[:, :, None] * 1e-6, axis=0)
+
+        covered = DEFENDED[choice]
+        gained = np.take_along_axis(recovery, np.broadcast_to(choice[..., None], choice.shape + (len(SYSTEMS),)), axis=1)
+        updated = np.where(covered, np.maximum(0, systems - damage + gained), systems)
+        systems = np.where(alive[..., None], updated, systems)
+        score += alive * (success - np.take_along_axis(costs, choice, axis=1))
+
+        # The game ends the mission once Earth's health reaches zero
+        alive &= np.floor(systems.sum(axis=-1) / 3) > 0
+
+    return score, alive
+
+
+def summarize(combos, policy, score, alive):
+    """One result row per parameter combination"""
+    percentiles = np.percentile(score, [10, 50, 90], axis=1)
+    rows = []
+    for index, params in enumerate(combos):
+        row = dict(zip(PARAMETERS, params.tolist()))
+        row.update({
+            'policy': policy,
+            'win_rate': float(alive[index].mean()),
+            'score_p10': float(percentiles[0, index]),
+            'score_p50': float(percentiles[1, index]),
+            'score_p90': float(percentiles[2, index]),
+            'score_max': float(score[index].max()),
+        })
+        for threshold, rank, _ in RANKS[:-1]:
+            row[f'reach_{threshold}'] = float((score[index] >= threshold).mean())
+        rows.append(row)
+    return rows
+
+
+# The flare pool and sequences are shipped to each worker once, not with every chunk
+_DAMAGE = None
+_SEQUENCES = None
+
+
+def _load_sequences(damage, sequences):
+    global _DAMAGE, _SEQUENCES
+    _DAMAGE, _SEQUENCES = damage, sequences
+
+
+def run_chunk(combos, policies, seed):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for policy in policies:
+        score, alive = simulate(combos, _DAMAGE, _SEQUENCES, policy, rng)
+        rows.extend(summarize(combos, policy, score, alive))
+    return rows
+
+
+def sweep(combos, damage, sequences, policies=POLICIES, workers=None, chunk_size=16, seed=0):
+    """Run the grid in a process pool; chunks hold several combinations so each worker stays vectorized"""
+    chunks = [combos[start:start + chunk_size] for start in range(0, len(combos), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_load_sequences, initargs=(damage, sequences)) as pool:
+        futures = [pool.submit(run_chunk, chunk, policies, seed + index) for index, chunk in enumerate(chunks)]
+        return [row for future in futures for row in future.result()]
+
+
+def float_list(text):
+    return [float(value) for value in text.split(',')]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Sweep Solar Defender balance parameters over flare sequences')
+    parser.add_argument('--impact-scale', type=float_list, default=[0.5, 0.75, 1.0, 1.25, 1.5])
+    parser.add_argument('--recovery-scale', type=float_list, default=[0.5, 1.0, 1.5, 2.0])
+    parser.add_argument('--cost-scale', type=float_list, default=[0.5, 1.0, 1.5])
+    parser.add_argument('--success-points', type=float_list, default=[15, 20, SUCCESS_POINTS, 30, 35])
+    parser.add_argument('--policies', type=lambda text: text.split(','), default=POLICIES)
+    parser.add_argument('--archive', default='flare_archive', help='flare archive for real sequences')
+    parser.add_argument('--synthetic', type=int, default=20000, help='number of synthetic sequences')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--csv', help='write every result row to this file')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    unknown = set(args.policies) - set(POLICIES)
+    if unknown:
+        raise SystemExit(f"Unknown policies: {', '.join(sorted(unknown))} (choose from {', '.join(POLICIES)})")
+
+    real = archive_sequences(args.archive)
+    damage, sequences = combine_sequences(real, synthetic_sequences(args.synthetic, seed=args.seed))
+    if not len(sequences):
+        raise SystemExit("No flare sequences to play; archive some flares or pass --synthetic N")
+    combos = parameter_grid(args.impact_scale, args.recovery_scale, args.cost_scale, args.success_points)
+
+    started = time.perf_counter()
+    rows = sweep(combos, damage, sequences, args.policies, args.workers, args.chunk_size, args.seed)
+    elapsed = time.perf_counter() - started
+    games = len(combos) * len(sequences) * len(args.policies)
+    print(f"🎲 Played {games:,} games ({len(combos):,} parameter sets × {len(sequences):,} sequences "
+          f"[{len(real[1]):,} real] × {len(args.policies)} policies) in {elapsed:.2f}s ({games / elapsed:,.0f} games/s)")
+    print(f"💥 Damage from {'the impact model' if load_model() is not None else 'the game_rules.py table'}")
+
+    rank_columns = [(f'reach_{threshold}', rank) for threshold, rank, _ in RANKS[:-1]]
+    print("\n🏅 Rank reachability (any policy):")
+    for column, rank in rank_columns:
+        reachable = {tuple(row[name] for name in PARAMETERS) for row in rows if row[column] > 0}
+        print(f"  {rank}: reachable in {len(reachable)}/{len(combos)} parameter sets")
+
+    current = [1.0, 1.0, 1.0, float(SUCCESS_POINTS)]
+    print("\n📏 Current rules:")
+    for row in rows:
+        if [row[name] for name in PARAMETERS] == current:
+            ranks = ' '.join(f"{row[column]:.0%}" for column, _ in rank_columns)
+            print(f"  {row['policy']:>10}: win {row['win_rate']:.0%}  score p10/p50/p90 "
+                  f"{row['score_p10']:.0f}/{row['score_p50']:.0f}/{row['score_p90']:.0f}  "
+                  f"max {row['score_max']:.0f}  ranks {ranks}")
+
+    # Balanced sets: the best policy should win without every game ending in the top rank
+    print(f"\n⚖️ Top {args.top} parameter sets by median score spread across policies:")
+    by_combo = {}
+    for row in rows:
+        by_combo.setdefault(tuple(row[name] for name in PARAMETERS), []).append(row)
+    spreads = sorted(by_combo.items(),
+                     key=lambda item: -(max(r['score_p50'] for r in item[1]) - min(r['score_p50'] for r in item[1])))
+    for params, group in spreads[:args.top]:
+        best = max(group, key=lambda r: r['score_p50'])
+        print(f"  {dict(zip(PARAMETERS, params))} best={best['policy']} "
+              f"win {best['win_rate']:.0%} p50 {best['score_p50']:.0f}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\n💾 Wrote {len(rows):,} rows to {args.csv}")
@@ -0,0 +1,296 @@
+import argparse
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+from flare_times import MISSING, parse_epochs
+from render_cache import RenderCache
+
+
+def endpoint_of(url):
+    """DONKI endpoint name ('FLR', 'CME', ...) from a request URL or path"""
+    return urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+
+def load_fixture(path):
+    """Read recorded DONKI responses from a gzipped NDJSON fixture, oldest first"""
+    records = []
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        for line in handle:
+            if line.strip():
+                records.append(json.loads(line))
+    records.sort(key=lambda record: record['recorded_at'])
+    return records
+
+
+def write_fixture(records, path):
+    """Write records as a gzipped NDJSON fixture"""
+    with gzip.open(path, 'wt', encoding='utf-8') as handle:
+        for record in records:
+            handle.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+def fixture_from_events(events, path, endpoint='FLR', time_field='beginTime'):
+    """Turn an archived DONKI event list into a fixture with one poll per event at its real time"""
+    # Parsed in one batch; naive and 'Z' timestamps are both UTC
+    stamps = parse_epochs([event.get(time_field) for event in events])
+    records = []
+    for event, stamp in zip(events, stamps.tolist()):
+        if stamp == MISSING:
+            continue
+        records.append({
+            'recorded_at': float(stamp),
+            'endpoint': endpoint,
+            'params': {},
+            'status': 200,
+            'body': [event]
+        })
+    records.sort(key=lambda record: record['recorded_at'])
+    write_fixture(records, path)
+    return len(records)
+
+
+class ReplayResponse:
+    """Just enough of requests.Response for the fetch code"""
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+        self.ok = 200 <= status_code < 400
+
+    @property
+    def text(self):
+        return json.dumps(self.body)
+
+    def json(self):
+        return self.body
+
+
+class RecordingSession:
+    """requests-compatible get() that appends every DONKI response to a fixture"""
+
+    def __init__(self, path, session=requests):
+        self.path = path
+        self.session = session
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        response = self.session.get(url, params=params, **kwargs)
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+
+        # Each append is its own gzip member, which gzip.open reads back as one stream
+        record = {
+            'recorded_at': time.time(),
+            'endpoint': endpoint_of(url),
+            'params': {k: v for k, v in (params or {}).items() if k != 'api_key'},
+            'status': response.status_code,
+            'body': body
+        }
+        with self.lock, gzip.open(self.path, 'at', encoding='utf-8') as handle:
+            handle.write(json.dumps(record, separators=(',', ':')) + '\n')
+        return response
+
+
+class DonkiReplayer:
+    """Serve recorded responses in order, keeping their original spacing divided by speedup"""
+
+    def __init__(self, records, speedup=1000.0, loop=False):
+        if isinstance(records, str):
+            records = load_fixture(records)
+        self.records = records
+        self.by_endpoint = {}
+        for record in records:
+            self.by_endpoint.setdefault(record['endpoint'], []).append(record)
+        self.speedup = speedup
+        self.loop = loop
+        self.lock = threading.Lock()
+        self.positions = {}
+        self.cycles = {}
+        self.started = None
+
+        # With loop=True each pass is laid after the previous one, one average gap later
+        times = [record['recorded_at'] for record in records]
+        span = times[-1] - times[0] if times else 0.0
+        self.cycle_span = span + (span / (len(times) - 1) if len(times) > 1 else 0.0)
+
+    def exhausted(self, endpoint='FLR'):
+        if self.loop:
+            return False
+        return self.positions.get(endpoint, 0) >= len(self.for_endpoint(endpoint))
+
+    def for_endpoint(self, endpoint):
+        return self.by_endpoint.get(endpoint, [])
+
+    def next_record(self, endpoint):
+        """Return the next record for endpoint, sleeping until its scaled time comes up"""
+        with self.lock:
+            records = self.for_endpoint(endpoint)
+            if not records:
+                return None
+            position = self.positions.get(endpoint, 0)
+            if position >= len(records):
+                if not self.loop:
+                    return records[-1]
+                position = 0
+                self.cycles[endpoint] = self.cycles.get(endpoint, 0) + 1
+            self.positions[endpoint] = position + 1
+            offset = self.cycles.get(endpoint, 0) * self.cycle_span
+            record = records[position]
+
+            if self.started is None:
+                self.started = (time.monotonic(), self.records[0]['recorded_at'])
+
+        start_clock, first_recorded = self.started
+        due = start_clock + (record['recorded_at'] - first_recorded + offset) / self.speedup
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return record
+
+    def get(self, url, params=None, **kwargs):
+        """Direct injection: drop-in replacement for requests.get"""
+        record = self.next_record(endpoint_of(url))
+        if record is None:
+            return ReplayResponse(404, [])
+        return ReplayResponse(record['status'], record['body'])
+
+
+class ReplayServer:
+    """Local stand-in for api.nasa.gov/DONKI backed by a DonkiReplayer"""
+
+    def __init__(self, replayer, host='127.0.0.1', port=0):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                record = replayer.next_record(endpoint_of(self.path))
+                status, body = (404, []) if record is None else (record['status'], record['body'])
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/DONKI'
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record(path, days=30, api_key='DEMO_KEY'):
+    """Record one live DONKI flare response into a fixture"""
+    session = RecordingSession(path)
+    params = {
+        'startDate': (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d'),
+        'endDate': datetime.now().strftime('%Y-%m-%d'),
+        'api_key': api_key
+    }
+    response = session.get('https://api.nasa.gov/DONKI/FLR', params=params, timeout=30)
+    print(f"📼 Recorded DONKI response ({response.status_code}) into {path}")
+
+
+def replay(path, speedup=1000.0, serve=False, game=False):
+    """Push every recorded poll through AmazingSpaceWeatherAI.get_space_weather_data,
+    or with game=True through EnhancedSolarDefenderGame.fetch_solar_data"""
+    replayer = DonkiReplayer(path, speedup=speedup)
+    server = ReplayServer(replayer).start() if serve else None
+    http = requests if serve else replayer
+    donki_url = server.url if serve else 'replay://DONKI'
+    # Replayed flares and renders stay out of the real flare archive and render cache
+    workdir = tempfile.mkdtemp(prefix='replay-')
+    render_cache = RenderCache(os.path.join(workdir, 'cache'))
+
+    if game:
+        from NASA_geam import EnhancedSolarDefenderGame
+
+        def poll():
+            # The game downloads in the background from its constructor; fetch_solar_data waits for it
+            solar_game = EnhancedSolarDefenderGame(http=http, donki_url=donki_url)
+            solar_game.render_cache = render_cache
+            try:
+                solar_game.fetch_solar_data()
+                return solar_game.solar_data
+            finally:
+                solar_game.executor.shutdown(wait=True)
+    else:
+        from Nasa import AmazingSpaceWeatherAI
+
+        ai_system = AmazingSpaceWeatherAI(http=http, donki_url=donki_url,
+                                          archive_dir=os.path.join(workdir, 'archive'))
+        ai_system.render_cache = render_cache
+        poll = ai_system.get_space_weather_data
+
+    started = time.monotonic()
+    polls = 0
+    try:
+        while not replayer.exhausted():
+            flares = poll()
+            polls += 1
+            print(f"🔁 Poll {polls}: {len(flares)} flares")
+    finally:
+        if server:
+            server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"✅ Replayed {polls} polls in {time.monotonic() - started:.1f}s at {speedup:g}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Record and replay DONKI traffic')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='capture a live DONKI flare response')
+    record_parser.add_argument('fixture')
+    record_parser.add_argument('--days', type=int, default=30)
+    record_parser.add_argument('--api-key', default='DEMO_KEY')
+
+    events_parser = commands.add_parser('from-events', help='build a fixture from a saved DONKI JSON list')
+    events_parser.add_argument('events_json')
+    events_parser.add_argument('fixture')
+
+    replay_parser = commands.add_parser('replay', help='feed a fixture through the pipeline')
+    replay_parser.add_argument('fixture')
+    replay_parser.add_argument('--speedup', type=float, default=1000.0)
+    replay_parser.add_argument('--serve', action='store_true', help='go through a local stand-in HTTP server')
+    replay_parser.add_argument('--game', action='store_true', help='drive the Solar Defender game instead')
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(args.fixture, args.days, args.api_key)
+    elif args.command == 'from-events':
+        with open(args.events_json, encoding='utf-8') as handle:
+            count = fixture_from_events(json.load(handle), args.fixture)
+        print(f"📼 Wrote {count} replay records into {args.fixture}")
+    else:
+        replay(args.fixture, args.speedup, args.serve, args.game)
@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+from flare_times import EPOCH_COLUMNS, MISSING, flare_epochs, with_epochs
+
+# Fields kept from each raw DONKI flare record
+SOURCE_COLUMNS = ['flareID', 'classType', 'beginTime', 'peakTime', 'endTime', 'sourceLocation']
+# Plus 'linkedCME' (derived from linkedEvents) and the int64 epoch seconds of each time field
+FLARE_COLUMNS = SOURCE_COLUMNS + ['linkedCME'] + list(EPOCH_COLUMNS.values())
+
+
+def linked_cme(linked_events):
+    """Whether a DONKI linkedEvents list links a CME"""
+    return any('-CME-' in (event.get('activityID') or '') for event in linked_events or [])
+
+
+def normalize_flare(flare):
+    """Reduce a raw DONKI flare record to its source columns and linkedCME (epochs come from with_epochs)"""
+    record = {column: flare.get(column) for column in SOURCE_COLUMNS}
+    # DONKI occasionally leaves classType null; every reader indexes it as a string
+    record['classType'] = record['classType'] or 'B1.0'
+    record['linkedCME'] = linked_cme(flare.get('linkedEvents'))
+    return record
+
+
+class FlareArchive:
+    """Local store of DONKI flares, one NDJSON file per month of beginTime"""
+
+    def __init__(self, directory='flare_archive'):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.known_ids = None
+        os.makedirs(directory, exist_ok=True)
+
+    def month_files(self):
+        """Archive files sorted by month"""
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.ndjson'))
+
+    def version(self):
+        """Cheap fingerprint of the archive contents (changes whenever a flare is added)"""
+        fingerprint = []
+        for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            if entry.name.endswith('.ndjson'):
+                stat = entry.stat()
+                fingerprint.append((entry.name, stat.st_size, stat.st_mtime_ns))
+        return tuple(fingerprint)
+
+    def add(self, flares):
+        """Append new flares (deduplicated by flareID) and return how many were stored"""
+        with self.lock:
+            if self.known_ids is None:
+                self.known_ids = set(self.load()['flareID'])
+
+            records = []
+            for flare in flares:
+                flare_id = flare.get('flareID')
+                if not flare_id or not flare.get('beginTime') or flare_id in self.known_ids:
+                    continue
+                self.known_ids.add(flare_id)
+                records.append(normalize_flare(flare))
+            if not records:
+                return 0
+
+            # Parse every time field once, here, in one batch; missing epochs are stored as null
+            frame = pd.DataFrame(records, columns=SOURCE_COLUMNS)
+            for column, epoch_column in EPOCH_COLUMNS.items():
+                for record, epoch in zip(records, flare_epochs(frame, column).tolist()):
+                    record[epoch_column] = epoch if epoch != MISSING else None
+
+            by_month = {}
+            for record in records:
+                by_month.setdefault(record['beginTime'][:7], []).append(record)
+
+            for month, records in by_month.items():
+                with open(os.path.join(self.directory, f'{month}.ndjson'), 'a', encoding='utf-8') as handle:
+                    handle.writelines(json.dumps(record) + '\n' for record in records)
+            return sum(len(records) for records in by_month.values())
+
+    def load(self, start=None, end=None):
+        """Flares with start <= beginTime < end (ISO strings or dates, naive = UTC), oldest first"""
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+
+        records = []
+        for name in self.month_files():
+            month = name[:7]
+            # Skip whole months outside the range before reading them
+            if (start is not None and month < start.strftime('%Y-%m')) or (end is not None and month > end.strftime('%Y-%m')):
+                continue
+            with open(os.path.join(self.directory, name), encoding='utf-8') as handle:
+                records.extend(json.loads(line) for line in handle if line.strip())
+
+        # Records archived before linkedCME existed still carry the raw linkedEvents list, and
+        # ones archived before classType was defaulted may have it null
+        for record in records:
+            if 'linkedCME' not in record:
+                record['linkedCME'] = linked_cme(record.get('linkedEvents'))
+            record['classType'] = record.get('classType') or 'B1.0'
+
+        # Only records archived before epochs were stored get parsed here
+        data = with_epochs(pd.DataFrame(records, columns=FLARE_COLUMNS))
+        if start is not None:
+            data = data[data['beginEpoch'] >= int(start.timestamp())]
+        if end is not None:
+            data = data[data['beginEpoch'] < int(end.timestamp())]
+        return data.sort_values('beginEpoch', kind='stable').reset_index(drop=True)
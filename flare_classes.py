@@ -0,0 +1,30 @@
+import numpy as np
+
+# GOES X-ray class letters and the peak flux (W/m^2) of a class "1.0" flare
+CLASS_LETTERS = ['A', 'B', 'C', 'M', 'X']
+CLASS_BASE_FLUX = {'A': 1e-8, 'B': 1e-7, 'C': 1e-6, 'M': 1e-5, 'X': 1e-4}
+
+
+def class_to_flux(class_types):
+    """Convert class strings like 'M2.1' to peak X-ray flux, vectorized"""
+    classes = np.asarray(class_types, dtype=str)
+    if classes.size == 0:
+        return np.zeros(0)
+
+    letters = np.char.upper(np.char.ljust(classes, 1).astype('U1'))
+    base = np.full(classes.shape, CLASS_BASE_FLUX['B'])
+    for letter, flux in CLASS_BASE_FLUX.items():
+        base[letters == letter] = flux
+
+    # Unknown letters keep the B-class fallback used by the impact tables
+    magnitudes = np.ones(classes.shape)
+    tails = np.char.strip(np.char.lstrip(classes, 'ABCMXabcmx'))
+    numeric = np.char.str_len(tails) > 0
+    numeric[numeric] = np.char.isnumeric(np.char.replace(tails[numeric], '.', '', count=1))
+    magnitudes[numeric] = tails[numeric].astype(float)
+    return base * magnitudes
+
+
+def flux_to_intensity(flux):
+    """Map flux onto a log scale where C1.0 = 1, M1.0 = 2, X1.0 = 3 (never negative)"""
+    return np.clip(np.log10(np.asarray(flux, dtype=float) / 1e-6) + 1.0, 0.0, None)
@@ -0,0 +1,150 @@
+import numpy as np
+
+from flare_classes import class_to_flux
+from flare_times import MISSING, flare_epochs
+
+DAY = 86400.0
+
+# Gamma prior on the background rate (events/day) used while history is too short
+# to fit the self-exciting part; roughly solar-cycle averages
+PRIOR_RATE_PER_DAY = {'M': 0.5, 'X': 0.03}
+PRIOR_DAYS = 30.0
+MIN_EVENTS_FOR_HAWKES = 5
+
+
+class HawkesForecaster:
+    """Self-exciting (Hawkes) event rate with an exponential kernel.
+
+    lambda(t) = mu + n * beta * sum_i exp(-beta * (t - t_i))
+
+    fit() scores a whole (beta, n) grid against the full history at once;
+    update() folds in one new event in O(1) without refitting.
+    """
+
+    def __init__(self, prior_rate_per_day=0.5,
+                 betas=1.0 / (np.geomspace(1.0, 30.0 * 24.0, 24) * 3600.0),
+                 branching=np.linspace(0.0, 0.9, 19)):
+        self.prior_rate = prior_rate_per_day / DAY
+        self.betas = np.asarray(betas, dtype=float)
+        self.branching = np.asarray(branching, dtype=float)
+        self.mu = self.prior_rate
+        self.n = 0.0
+        self.beta = self.betas[0]
+        self.excitation = 0.0  # sum_i exp(-beta * (t_last - t_i))
+        self.first_time = None
+        self.last_time = None
+        self.observed_until = None
+        self.event_count = 0
+        self.kernel_fitted = False
+
+    def fit(self, times, end=None):
+        """Fit to sorted event times (epoch seconds) observed up to end"""
+        times = np.sort(np.asarray(times, dtype=float))
+        self.event_count = times.size
+        self.kernel_fitted = times.size >= MIN_EVENTS_FOR_HAWKES
+        if times.size == 0:
+            self.mu, self.n, self.excitation = self.prior_rate, 0.0, 0.0
+            self.first_time = self.last_time = self.observed_until = None
+            return self
+
+        end = max(float(end if end is not None else times[-1]), times[-1])
+        start = times[0]
+        span = max(end - start, 3600.0)
+        self.first_time = start
+        self.last_time = times[-1]
+        self.observed_until = end
+
+        if times.size < MIN_EVENTS_FOR_HAWKES:
+            # Too few events for the kernel: Gamma-Poisson posterior mean of the rate
+            prior_seconds = PRIOR_DAYS * DAY
+            self.mu = (times.size + self.prior_rate * prior_seconds) / (span + prior_seconds)
+            self.n = 0.0
+            self.excitation = 0.0
+            return self
+
+        relative = times - start
+        scaled = self.betas[:, None] * relative[None, :]  # (B, N)
+
+        # log sum_{j<i} exp(-beta (t_i - t_j)) through a running log-sum-exp
+        running = np.logaddexp.accumulate(scaled, axis=1)
+        log_excitation = np.full(scaled.shape, -np.inf)
+        log_excitation[:, 1:] = running[:, :-1] - scaled[:, 1:]
+        excitation = np.exp(log_excitation)  # (B, N)
+        compensator_tail = np.sum(1.0 - np.exp(-self.betas[:, None] * (end - times)[None, :]), axis=1)  # (B,)
+
+        # Background rate from the moment condition E[N(T)] = N for every (beta, n)
+        n = self.branching[None, :]
+        mu = np.clip((times.size - n * compensator_tail[:, None]) / span, 1e-12, None)  # (B, K)
+        rate = mu[:, :, None] + n[:, :, None] * self.betas[:, None, None] * excitation[:, None, :]
+        log_likelihood = (np.log(rate).sum(axis=2) - mu * span - n * compensator_tail[:, None])
+
+        b, k = np.unravel_index(np.argmax(log_likelihood), log_likelihood.shape)
+        self.beta = self.betas[b]
+        self.n = self.branching[k]
+        self.mu = mu[b, k]
+        self.excitation = np.exp(running[b, -1] - scaled[b, -1])
+        return self
+
+    def update(self, event_time):
+        """Add one event in O(1) (kernel parameters stay as fitted)"""
+        if self.last_time is not None:
+            self.excitation *= np.exp(-self.beta * max(event_time - self.last_time, 0.0))
+        self.excitation += 1.0
+        self.first_time = event_time if self.first_time is None else min(self.first_time, event_time)
+        self.last_time = event_time if self.last_time is None else max(self.last_time, event_time)
+        self.observed_until = max(self.observed_until or event_time, event_time)
+        self.event_count += 1
+
+        if not self.kernel_fitted:
+            # Still on the prior: the Gamma-Poisson posterior mean takes the event in O(1) too
+            prior_seconds = PRIOR_DAYS * DAY
+            span = max(self.observed_until - self.first_time, 3600.0)
+            self.mu = (self.event_count + self.prior_rate * prior_seconds) / (span + prior_seconds)
+
+    def expected_events(self, now, horizon=DAY):
+        """Expected number of events in (now, now + horizon]"""
+        expected = self.mu * horizon
+        if self.last_time is not None and self.n > 0:
+            decayed = self.excitation * np.exp(-self.beta * max(now - self.last_time, 0.0))
+            expected += self.n * decayed * (1.0 - np.exp(-self.beta * horizon))
+        return expected
+
+    def probability(self, now, horizon=DAY):
+        """Probability of at least one event in the horizon"""
+        return 1.0 - np.exp(-self.expected_events(now, horizon))
+
+
+class FlareForecast:
+    """24h probability of at least one >=M and >=X flare"""
+
+    def __init__(self):
+        self.models = {letter: HawkesForecaster(rate) for letter, rate in PRIOR_RATE_PER_DAY.items()}
+        self.thresholds = {'M': 1e-5, 'X': 1e-4}
+
+    def fit(self, data, now=None):
+        epochs = flare_epochs(data)
+        valid = epochs != MISSING
+        epochs = epochs[valid]
+        fluxes = class_to_flux(data['classType'])[valid]
+        for letter, model in self.models.items():
+            model.fit(epochs[fluxes >= self.thresholds[letter]], end=now)
+        return self
+
+    def update(self, event_time, flux):
+        """Fold one new flare into every model it qualifies for, in O(1)"""
+        for letter, model in self.models.items():
+            if flux >= self.thresholds[letter]:
+                model.update(event_time)
+
+    def update_data(self, data):
+        """Fold a DataFrame of new flares (not seen by fit or earlier updates) in time order"""
+        epochs = flare_epochs(data)
+        order = np.argsort(epochs, kind='stable')
+        order = order[epochs[order] != MISSING]
+        fluxes = class_to_flux(data['classType'].to_numpy()[order])
+        for event_time, flux in zip(epochs[order].tolist(), fluxes.tolist()):
+            self.update(float(event_time), flux)
+        return self
+
+    def probabilities(self, now, horizon=DAY):
+        return {letter: float(model.probability(now, horizon)) for letter, model in self.models.items()}
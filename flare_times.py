@@ -0,0 +1,157 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+# DONKI's own timestamp layout ('2024-05-14T16:51Z'); every generated timestamp uses it too
+TIME_FORMAT = '%Y-%m-%dT%H:%MZ'
+
+# Missing/unparseable timestamps; the same bit pattern as NaT, so it converts to NaT for free
+MISSING = np.iinfo(np.int64).min
+
+# Epoch column stored next to each ISO column of a flare record
+EPOCH_COLUMNS = {'beginTime': 'beginEpoch', 'peakTime': 'peakEpoch', 'endTime': 'endEpoch'}
+
+WIDTH = 32
+MONTH_DAY_DIGITS = [5, 6, 8, 9]
+TIME_DIGITS = [11, 12, 14, 15]
+# Days per month (index 0 unused); February gets its leap day separately
+MONTH_DAYS = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int32)
+
+
+def _character_codes(values):
+    """(N, WIDTH) uint8 matrix of the strings' characters, zero padded"""
+    try:
+        return np.asarray(values, dtype=f'S{WIDTH}').reshape(-1).view(np.uint8).reshape(-1, WIDTH)
+    except UnicodeEncodeError:
+        # Non-ASCII input: clip to one byte per character (such values never parse on the fast path)
+        chars = np.asarray(values, dtype=f'U{WIDTH}').reshape(-1).view(np.uint32).reshape(-1, WIDTH)
+        return np.minimum(chars, 255).astype(np.uint8)
+
+
+def _number(digits, start, end):
+    value = digits[:, start].astype(np.int32)
+    for position in range(start + 1, end):
+        value = value * np.int32(10) + digits[:, position]
+    return value
+
+
+def parse_epochs(values):
+    """ISO timestamps to int64 epoch seconds (UTC), vectorized.
+
+    'YYYY-MM-DDTHH:MM[:SS[.fff]][Z]' is decoded straight from the character
+    codes; naive values count as UTC, and impossible dates ('2024-02-30') are
+    rejected like pandas does. Anything else that still starts with a year
+    (date only, unpadded fields, offsets like '+02:00', values longer than
+    WIDTH) goes through pandas untruncated; the rest becomes MISSING.
+    Datetime arrays/columns are converted by their own unit.
+    """
+    if getattr(values, 'dtype', None) is not None and values.dtype.kind == 'M':
+        # Already datetimes: convert by unit (pandas holds us or ns, never assume one); NaT stays MISSING
+        return np.asarray(values.to_numpy(dtype='datetime64[s]') if isinstance(values, (pd.Series, pd.Index))
+                          else values.astype('datetime64[s]')).view(np.int64)
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy()
+    values = np.asarray(values, dtype=object).reshape(-1)
+    codes = _character_codes(values)
+    digits = codes[:, :19] - np.uint8(ord('0'))  # wraps around for non-digits, so "< 10" checks both ends
+
+    # Anything starting with a year that the fast path rejects (date only, offsets, '2024-5-1') goes to pandas
+    dated = (digits[:, :4] < 10).all(axis=1) & (codes[:, 4] == ord('-'))
+    ok = dated & (digits[:, MONTH_DAY_DIGITS] < 10).all(axis=1) & (codes[:, 7] == ord('-'))
+    ok &= (digits[:, TIME_DIGITS] < 10).all(axis=1) & (codes[:, 13] == ord(':'))
+    ok &= (codes[:, 10] == ord('T')) | (codes[:, 10] == ord(' '))
+
+    # After the minutes: either nothing or ':SS' with an optional '.fff' fraction, then an optional 'Z'
+    has_seconds = codes[:, 16] == ord(':')
+    ok &= ~has_seconds | (digits[:, 17:19] < 10).all(axis=1)
+    end = np.where(has_seconds, 19, 16)
+    fraction = np.flatnonzero(has_seconds & (codes[:, 19] == ord('.')))
+    fraction_digits = np.cumprod(codes[fraction, 20:] - np.uint8(ord('0')) < 10, axis=1).sum(axis=1)
+    ok[fraction] &= fraction_digits > 0
+    end[fraction] = 20 + fraction_digits
+    end += codes[np.arange(len(codes)), np.minimum(end, WIDTH - 1)] == ord('Z')
+    # Nothing may follow; a value filling every column may have been cut off, so pandas gets those
+    length = (codes != 0).sum(axis=1)
+    ok &= (length == end) & (length < WIDTH)
+
+    year, month, day = _number(digits, 0, 4), _number(digits, 5, 7), _number(digits, 8, 10)
+    hour, minute = _number(digits, 11, 13), _number(digits, 14, 16)
+    second = np.where(has_seconds, _number(digits, 17, 19), 0)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = MONTH_DAYS[np.clip(month, 0, 12)] + ((month == 2) & leap)
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days) & (hour < 24) & (minute < 60) & (second < 60)
+
+    # Days since 1970-01-01 from the proleptic Gregorian date (Hinnant's days_from_civil)
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    days = (era * 146097 + day_of_era - 719468).astype(np.int64)
+
+    epochs = np.where(ok, days * 86400 + (hour * 3600 + minute * 60 + second), MISSING)
+
+    slow = dated & ~ok
+    if slow.any():
+        # The original values, not the fixed-width codes, which cut off anything past WIDTH
+        strings = [value.decode('latin-1') if isinstance(value, bytes) else str(value) for value in values[slow]]
+        parsed = pd.to_datetime(pd.Series(strings), utc=True, errors='coerce', format='ISO8601')
+        epochs[slow] = parsed.dt.as_unit('s').to_numpy(dtype='datetime64[s]').view(np.int64)
+    return epochs
+
+
+def as_epochs(values):
+    """Epoch seconds from either epoch integers (passed through) or ISO strings"""
+    array = np.asarray(values)
+    if array.dtype.kind in 'iu':
+        return array.astype(np.int64)
+    return parse_epochs(array)
+
+
+def format_epochs(epochs):
+    """Epoch seconds to ISO strings in TIME_FORMAT, vectorized"""
+    stamps = np.asarray(epochs, dtype=np.int64).astype('datetime64[s]').astype('datetime64[m]')
+    return np.char.add(np.datetime_as_string(stamps, unit='m'), 'Z')
+
+
+def now_epoch():
+    return int(time.time())
+
+
+def flare_epochs(data, column='beginTime'):
+    """int64 epochs of one time column, from the stored epoch column where present"""
+    epoch_column = EPOCH_COLUMNS[column]
+    if epoch_column not in data:
+        return parse_epochs(data[column])
+    stored = data[epoch_column]
+    if stored.dtype.kind in 'iu':
+        return stored.to_numpy(dtype=np.int64)
+    if stored.dtype.kind == 'M':
+        return parse_epochs(stored)
+
+    # Partly filled (e.g. records archived before epochs were stored): parse only the gaps
+    missing = stored.isna().to_numpy()
+    epochs = np.empty(len(data), dtype=np.int64)
+    epochs[~missing] = stored[~missing].astype(np.int64)
+    epochs[missing] = parse_epochs(data[column].to_numpy()[missing])
+    return epochs
+
+
+def with_epochs(data):
+    """Fill the int64 epoch column of every ISO time column present (in place, returns data)"""
+    for column, epoch_column in EPOCH_COLUMNS.items():
+        if column in data:
+            data[epoch_column] = flare_epochs(data, column)
+    return data
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    epochs = rng.integers(1.3e9, 1.8e9, 1_000_000)
+    strings = format_epochs(epochs).astype(object)
+    started = time.perf_counter()
+    parsed = parse_epochs(strings)
+    elapsed = time.perf_counter() - started
+    assert np.array_equal(parsed, epochs // 60 * 60)
+    print(f"⏱️ Parsed {len(strings):,} timestamps in {elapsed:.3f}s ({len(strings) / elapsed:,.0f}/s)")
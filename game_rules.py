@@ -0,0 +1,29 @@
+# Tuning tables for Solar Defender, shared by the game and the balance sweep
+
+# Damage per flare class to each Earth system
+IMPACTS = {
+    'A': {'power': 0, 'satellites': 0, 'comm': 0, 'message': "Minimal impact", 'icon': '🌤️'},
+    'B': {'power': 5, 'satellites': 3, 'comm': 8, 'message': "Minor radio interference", 'icon': '📻'},
+    'C': {'power': 15, 'satellites': 10, 'comm': 20, 'message': "GPS and radio disruption", 'icon': '📡'},
+    'M': {'power': 30, 'satellites': 25, 'comm': 40, 'message': "Potential power grid fluctuations", 'icon': '⚡'},
+    'X': {'power': 50, 'satellites': 40, 'comm': 60, 'message': "Critical infrastructure at risk!", 'icon': '💥'}
+}
+
+# Recovery points per system and score cost of each defense choice
+DEFENSE_STRATEGIES = {
+    1: {'recovery': {'satellites': 15}, 'cost': 10},
+    2: {'recovery': {'power': 20}, 'cost': 15},
+    3: {'recovery': {'comm': 12}, 'cost': 8},
+    4: {'recovery': {'power': 10, 'satellites': 8, 'comm': 10}, 'cost': 20},
+}
+
+SUCCESS_POINTS = 25
+MISSION_PHASES = 5
+
+# Minimum score for each rank, best first
+RANKS = [
+    (80, "🌟 Solar Defender Master 🌟", "Amazing! You're a true space weather expert!"),
+    (50, "🎖️ Space Commander 🎖️", "Excellent work! Earth is in safe hands!"),
+    (25, "🚀 Space Cadet 🚀", "Good effort! Keep learning about space weather!"),
+    (float('-inf'), "⭐ Space Beginner ⭐", "Good start! More training will make you better!"),
+]
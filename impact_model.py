@@ -0,0 +1,205 @@
+import argparse
+import os
+import re
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from flare_classes import class_to_flux
+from flare_times import MISSING, as_epochs, flare_epochs
+
+MODEL_VERSION = 1
+DEFAULT_WEIGHTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', f'impact_model_v{MODEL_VERSION}.npz')
+
+FEATURES = ['log_flux', 'duration_hours', 'source_lat', 'source_lon', 'earth_facing', 'linked_cme']
+OUTPUTS = ['power', 'satellites', 'comm', 'gps', 'astronauts']
+
+# The game's lookup table (damage points per class), used to bootstrap training targets
+TABLE_CLASSES = np.log10([1e-8, 1e-7, 1e-6, 1e-5, 1e-4])
+TABLE_TARGETS = np.array([
+    # power, satellites, comm, gps, astronauts
+    [0, 0, 0, 0, 0],
+    [5, 3, 8, 4, 1],
+    [15, 10, 20, 18, 5],
+    [30, 25, 40, 35, 20],
+    [50, 40, 60, 55, 45],
+], dtype=float)
+
+LOCATION_PATTERN = re.compile(r'^([NS])(\d+)([EW])(\d+)$')
+
+
+def parse_locations(locations):
+    """DONKI source locations like 'N15W30' to (lat, lon) degrees; west positive, unknown = disk centre"""
+    lat = np.zeros(len(locations))
+    lon = np.zeros(len(locations))
+    for i, location in enumerate(locations):
+        match = LOCATION_PATTERN.match(location.strip().upper()) if isinstance(location, str) else None
+        if match:
+            lat[i] = float(match[2]) * (1 if match[1] == 'N' else -1)
+            lon[i] = float(match[4]) * (1 if match[3] == 'W' else -1)
+    return lat, lon
+
+
+def flare_features(class_types, begin_times=None, end_times=None, locations=None, linked_cme=None):
+    """Feature matrix (N, len(FEATURES)) from per-flare arrays; missing inputs get neutral defaults.
+
+    Times may be epoch seconds or ISO strings.
+    """
+    flux = class_to_flux(class_types)
+    count = flux.size
+
+    duration = np.full(count, 0.5)
+    if begin_times is not None and end_times is not None:
+        begin, end = as_epochs(begin_times), as_epochs(end_times)
+        known = (begin != MISSING) & (end != MISSING)
+        hours = np.where(known, (end - begin) / 3600.0, np.nan)
+        duration = np.where(known & (hours > 0), hours, duration)
+
+    lat, lon = parse_locations(locations if locations is not None else [None] * count)
+    cme = np.zeros(count) if linked_cme is None else np.asarray(linked_cme, dtype=float)
+
+    return np.column_stack([
+        np.log10(flux),
+        np.minimum(duration, 12.0),
+        lat,
+        lon,
+        np.cos(np.radians(lat)) * np.cos(np.radians(lon)),
+        np.nan_to_num(cme)
+    ])
+
+
+def data_features(data):
+    """Feature matrix for a flare DataFrame with DONKI column names"""
+    column = lambda name: data[name].tolist() if name in data else None
+    epochs = lambda name: flare_epochs(data, name) if name in data else None
+    return flare_features(data['classType'].tolist(), epochs('beginTime'), epochs('endTime'),
+                          column('sourceLocation'), column('linkedCME'))
+
+
+def synthetic_training_set(size=20000, seed=0):
+    """Training pairs bootstrapped from the lookup tables plus simple physical modifiers"""
+    rng = np.random.default_rng(seed)
+    log_flux = rng.uniform(-8.0, -3.3, size)
+    duration = rng.gamma(2.0, 0.4, size) * (1 + (log_flux + 8) / 2)
+    lat = rng.uniform(-35, 35, size)
+    lon = rng.uniform(-90, 90, size)
+    cme = (rng.random(size) < np.clip((log_flux + 6.5) / 3, 0.02, 0.9)).astype(float)
+
+    base = np.column_stack([np.interp(log_flux, TABLE_CLASSES, TABLE_TARGETS[:, k])
+                            for k in range(len(OUTPUTS))])
+    facing = np.cos(np.radians(lat)) * np.cos(np.radians(lon))
+    # Radio/GPS effects follow the dayside X-rays (disk position); power and satellites follow
+    # the CME, astronaut radiation follows magnetically connected (western) particle events
+    long_duration = 1 + 0.3 * np.tanh(duration - 1)
+    base[:, 2:4] *= (0.6 + 0.4 * facing[:, None]) * long_duration[:, None]
+    base[:, 0:2] *= (0.7 + 0.8 * cme[:, None] * facing[:, None])
+    base[:, 4] *= 0.6 + 0.9 * np.clip(lon, 0, 90) / 90
+    targets = np.clip(base + rng.normal(0, 1.5, base.shape), 0, 100)
+
+    features = np.column_stack([log_flux, np.minimum(duration, 12.0), lat, lon, facing, cme])
+    return features, targets
+
+
+class ImpactModel:
+    """One-hidden-layer MLP (tanh) mapping flare features to impact scores on a 0-100 scale"""
+
+    def __init__(self, params):
+        self.params = params
+
+    @classmethod
+    def initialize(cls, hidden=24, seed=0):
+        rng = np.random.default_rng(seed)
+        inputs, outputs = len(FEATURES), len(OUTPUTS)
+        return cls({
+            'mean': np.zeros(inputs), 'scale': np.ones(inputs),
+            'w1': rng.normal(0, 1 / np.sqrt(inputs), (inputs, hidden)), 'b1': np.zeros(hidden),
+            'w2': rng.normal(0, 1 / np.sqrt(hidden), (hidden, outputs)), 'b2': np.zeros(outputs),
+        })
+
+    def forward(self, features):
+        x = (features - self.params['mean']) / self.params['scale']
+        hidden = np.tanh(x @ self.params['w1'] + self.params['b1'])
+        output = 100.0 / (1.0 + np.exp(-(hidden @ self.params['w2'] + self.params['b2'])))
+        return x, hidden, output
+
+    def predict(self, features):
+        """Batch inference: (N, len(FEATURES)) -> (N, len(OUTPUTS))"""
+        return self.forward(np.asarray(features, dtype=float))[2]
+
+    def train(self, features, targets, epochs=3000, learning_rate=0.01):
+        """Full-batch Adam on mean squared error; returns the final loss"""
+        self.params['mean'] = features.mean(axis=0)
+        self.params['scale'] = features.std(axis=0) + 1e-9
+        names = ['w1', 'b1', 'w2', 'b2']
+        moments = {name: np.zeros_like(self.params[name]) for name in names}
+        velocities = {name: np.zeros_like(self.params[name]) for name in names}
+
+        for step in range(1, epochs + 1):
+            x, hidden, output = self.forward(features)
+            error = (output - targets) / len(features)
+            d_logits = error * output * (1 - output / 100.0)
+            d_hidden = (d_logits @ self.params['w2'].T) * (1 - hidden ** 2)
+            grads = {
+                'w2': hidden.T @ d_logits, 'b2': d_logits.sum(axis=0),
+                'w1': x.T @ d_hidden, 'b1': d_hidden.sum(axis=0),
+            }
+            for name in names:
+                moments[name] = 0.9 * moments[name] + 0.1 * grads[name]
+                velocities[name] = 0.999 * velocities[name] + 0.001 * grads[name] ** 2
+                corrected = moments[name] / (1 - 0.9 ** step)
+                self.params[name] -= learning_rate * corrected / (np.sqrt(velocities[name] / (1 - 0.999 ** step)) + 1e-8)
+        return float(np.mean((self.predict(features) - targets) ** 2))
+
+    def save(self, path=DEFAULT_WEIGHTS):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(path, version=MODEL_VERSION, features=FEATURES, outputs=OUTPUTS, **self.params)
+
+    @classmethod
+    def load(cls, path=DEFAULT_WEIGHTS):
+        with np.load(path) as weights:
+            if int(weights['version']) != MODEL_VERSION or list(weights['features']) != FEATURES:
+                raise ValueError(f"{path} holds incompatible impact model weights")
+            return cls({name: weights[name] for name in ['mean', 'scale', 'w1', 'b1', 'w2', 'b2']})
+
+
+@lru_cache(maxsize=4)
+def load_model(path=DEFAULT_WEIGHTS):
+    """Load weights once per path; None when they are missing or incompatible (callers fall back)"""
+    try:
+        return ImpactModel.load(path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def score_flares(data, path=DEFAULT_WEIGHTS):
+    """Impact scores for every flare in a DataFrame, or None without a usable model"""
+    model = load_model(path)
+    if model is None:
+        return None
+    return pd.DataFrame(model.predict(data_features(data)), columns=OUTPUTS, index=data.index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Train or benchmark the flare impact model')
+    parser.add_argument('command', choices=['train', 'bench'])
+    parser.add_argument('--weights', default=DEFAULT_WEIGHTS)
+    parser.add_argument('--flares', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        features, targets = synthetic_training_set()
+        model = ImpactModel.initialize()
+        loss = model.train(features, targets)
+        model.save(args.weights)
+        print(f"🧠 Trained impact model v{MODEL_VERSION} (MSE {loss:.2f}) -> {args.weights}")
+    else:
+        model = load_model(args.weights)
+        if model is None:
+            raise SystemExit(f"No usable weights at {args.weights}; run 'python impact_model.py train' first")
+        features, _ = synthetic_training_set(args.flares, seed=1)
+        started = time.perf_counter()
+        model.predict(features)
+        elapsed = time.perf_counter() - started
+        print(f"⚡ Scored {args.flares:,} flares in {elapsed:.3f}s ({args.flares / elapsed:,.0f} flares/s)")
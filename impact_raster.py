@@ -0,0 +1,96 @@
+from functools import lru_cache
+
+import numpy as np
+
+from flare_classes import class_to_flux, flux_to_intensity
+
+# Footprints are accumulated into a fixed number of bins, so the cost of a
+# raster depends on the grid resolution and not on how many flares there are
+AURORA_BINS = 32
+DECLINATION_BINS = 8
+MAX_DECLINATION = 23.44
+
+
+@lru_cache(maxsize=8)
+def lat_lon_grid(resolution=2.0):
+    """Cell-centre latitude/longitude vectors (degrees) for a global grid"""
+    lats = np.arange(-90 + resolution / 2, 90, resolution)
+    lons = np.arange(-180 + resolution / 2, 180, resolution)
+    lats.setflags(write=False)
+    lons.setflags(write=False)
+    return lats, lons
+
+
+def aurora_boundary(intensity):
+    """Equatorward edge of the aurora oval (degrees); stronger flares push it south"""
+    return np.clip(67.0 - 6.0 * np.asarray(intensity, dtype=float), 40.0, 67.0)
+
+
+@lru_cache(maxsize=8)
+def aurora_kernels(resolution=2.0):
+    """Latitude profile of the aurora oval for each boundary bin, shape (bins, nlat)"""
+    lats, _ = lat_lon_grid(resolution)
+    boundaries = np.linspace(40.0, 67.0, AURORA_BINS)
+    distance = np.abs(lats)[None, :] - boundaries[:, None]
+    kernels = np.exp(-(distance / 5.0) ** 2)
+    kernels.setflags(write=False)
+    return boundaries, kernels
+
+
+@lru_cache(maxsize=8)
+def blackout_kernel_spectra(resolution=2.0):
+    """FFT along longitude of the dayside footprint for each solar declination bin"""
+    lats, lons = lat_lon_grid(resolution)
+    declinations = np.linspace(-MAX_DECLINATION, MAX_DECLINATION, DECLINATION_BINS)
+
+    # Footprint of a flare with the sub-solar point at longitude 0 (cell 0 after the shift)
+    lat = np.radians(lats)[None, :, None]
+    dec = np.radians(declinations)[:, None, None]
+    dlon = np.radians(lons - lons[0])[None, None, :]
+    cos_zenith = np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(dlon)
+    spectra = np.fft.rfft(np.clip(cos_zenith, 0.0, None), axis=-1)
+    spectra.setflags(write=False)
+    return declinations, spectra
+
+
+def subsolar_point(begin_times):
+    """Sub-solar latitude/longitude (degrees) for an array of UTC timestamps"""
+    times = np.asarray(begin_times, dtype='datetime64[s]')
+    seconds_of_day = (times - times.astype('datetime64[D]')).astype(float)
+    day_of_year = (times.astype('datetime64[D]') - times.astype('datetime64[Y]')).astype(float)
+
+    latitude = -MAX_DECLINATION * np.cos(2 * np.pi * (day_of_year + 10) / 365.25)
+    longitude = 180.0 - seconds_of_day / 240.0
+    return latitude, (longitude + 180.0) % 360.0 - 180.0
+
+
+def flare_impact_raster(class_types, begin_times=None, resolution=2.0):
+    """Accumulate every flare's impact footprint into one (nlat, nlon) raster"""
+    lats, lons = lat_lon_grid(resolution)
+    raster = np.zeros((lats.size, lons.size))
+
+    intensity = flux_to_intensity(class_to_flux(class_types))
+    if intensity.size == 0:
+        return raster
+
+    # Aurora oval expansion: weights binned by boundary latitude, one matrix product
+    boundaries, kernels = aurora_kernels(resolution)
+    storm = intensity >= 2.0  # M1.0 and above
+    bins = np.clip(np.searchsorted(boundaries, aurora_boundary(intensity[storm])), 0, AURORA_BINS - 1)
+    aurora_weights = np.bincount(bins, weights=intensity[storm], minlength=AURORA_BINS)
+    raster += (aurora_weights @ kernels)[:, None]
+
+    # Dayside radio blackout: histogram over (declination, sub-solar longitude),
+    # then one circular convolution per declination bin
+    if begin_times is None:
+        begin_times = np.full(intensity.shape, np.datetime64('2024-06-21T12:00:00'))
+    sub_lat, sub_lon = subsolar_point(begin_times)
+    declinations, spectra = blackout_kernel_spectra(resolution)
+    dec_bins = np.clip(np.searchsorted(declinations, sub_lat), 0, DECLINATION_BINS - 1)
+    lon_bins = np.clip(((sub_lon + 180.0) / resolution).astype(int), 0, lons.size - 1)
+    histogram = np.zeros((DECLINATION_BINS, lons.size))
+    np.add.at(histogram, (dec_bins, lon_bins), intensity)
+    blackout = np.fft.irfft(spectra * np.fft.rfft(histogram, axis=-1)[:, None, :], n=lons.size, axis=-1)
+    raster += blackout.sum(axis=0)
+
+    return raster
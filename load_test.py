@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import time
+
+
+async def client(host, port, path, deadline, conditional, latencies, statuses):
+    """One keep-alive connection issuing requests back to back until the deadline"""
+    reader, writer = await asyncio.open_connection(host, port)
+    etag = None
+    try:
+        while time.perf_counter() < deadline:
+            request = f'GET {path} HTTP/1.1\r\nHost: {host}\r\n'
+            if conditional and etag:
+                request += f'If-None-Match: {etag}\r\n'
+            started = time.perf_counter()
+            writer.write((request + '\r\n').encode())
+
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = int(head[9:12])
+            length = 0
+            for line in head.decode('latin-1').split('\r\n')[1:]:
+                name, _, value = line.partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+                elif name.lower() == 'etag':
+                    etag = value.strip()
+            if length:
+                await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(host, port, path, connections, duration, conditional):
+    latencies = []
+    statuses = {}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, path, deadline, conditional, latencies, statuses)
+                           for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"📊 {path}: {count} requests in {elapsed:.1f}s over {connections} connections")
+    print(f"   🚀 Throughput: {count / elapsed:,.0f} req/s")
+    if count:
+        print(f"   ⏱️  Latency p50 {latencies[count // 2] * 1000:.2f} ms | "
+              f"p99 {latencies[int(count * 0.99)] * 1000:.2f} ms")
+    print(f"   📬 Status codes: {statuses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load test the space weather API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--path', default='/risk')
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--conditional', action='store_true', help='send If-None-Match with the last ETag')
+    args = parser.parse_args()
+
+    asyncio.run(run(args.host, args.port, args.path, args.connections, args.duration, args.conditional))
@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from flare_archive import FLARE_COLUMNS, normalize_flare
+from flare_times import with_epochs
+
+# Matches the cadence promised by the report ("Next update in: 3 hours")
+POLL_INTERVAL = 3 * 3600
+STAGES = ['fetch', 'report', 'render']
+
+
+def put_latest(queue, item):
+    """Put without waiting; when the queue is full the oldest (stale) items make room. Returns how many were dropped."""
+    dropped = 0
+    while queue.full():
+        queue.get_nowait()
+        queue.task_done()
+        dropped += 1
+    queue.put_nowait(item)
+    return dropped
+
+
+def write_atomic(path, payload):
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as handle:
+        handle.write(payload)
+    os.replace(temporary, path)
+
+
+class MonitorDaemon:
+    """Scheduled DONKI polling feeding a fetch -> report -> render pipeline.
+
+    Stages are joined by bounded queues and each stage has its own worker
+    thread, so a slow render never delays a poll: a snapshot waiting for a busy
+    stage is replaced by the newer one (coalesced) instead of queueing up.
+    Flares are kept in a rolling window of `window_hours`, so memory stays flat
+    however long the daemon runs; the archive keeps the full history on disk.
+    """
+
+    def __init__(self, ai_system, interval=POLL_INTERVAL, window_hours=7 * 24, output_dir='monitor_output',
+                 lookback_days=7, queue_size=1, render_dpi=100):
+        self.ai = ai_system
+        self.interval = interval
+        self.window_hours = window_hours
+        self.lookback_days = lookback_days
+        self.output_dir = output_dir
+        self.queue_size = queue_size
+        self.render_dpi = render_dpi
+        os.makedirs(output_dir, exist_ok=True)
+
+        self.executors = {stage: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'monitor-{stage}')
+                          for stage in STAGES}
+        self.window = with_epochs(pd.DataFrame(columns=FLARE_COLUMNS))
+        self.cycle = 0
+        self.last_reported = None
+        self.reported_cycle = 0
+        self.stats = {
+            'polls': 0, 'poll_errors': 0, 'new_flares': 0, 'skipped_ticks': 0,
+            'reports': 0, 'unchanged': 0, 'renders': 0,
+            'dropped_reports': 0, 'dropped_renders': 0, 'stale_renders': 0,
+            'last_poll': None, 'last_render': None, 'window_flares': 0,
+        }
+        self.stopping = None
+
+    # Stage 1: fetch (blocking parts run on the fetch thread)
+
+    def fetch(self):
+        """Poll DONKI once, archive what is new and return the updated rolling window"""
+        now = datetime.now(timezone.utc)
+        params = {'startDate': (now - timedelta(days=self.lookback_days)).strftime('%Y-%m-%d'),
+                  'endDate': now.strftime('%Y-%m-%d'), 'api_key': self.ai.api_key}
+        response = self.ai.http.get(f"{self.ai.donki_url}/FLR", params=params, timeout=10)
+        if response.status_code != 200:
+            raise RuntimeError(f"DONKI answered {response.status_code}")
+        flares = response.json() or []
+        self.ai.archive.add(flares)
+
+        # DONKI returns the whole lookback on every poll; only unseen flares inside the window join it
+        cutoff = int(time.time() - self.window_hours * 3600)
+        known = set(self.window['flareID'])
+        fresh = with_epochs(pd.DataFrame([normalize_flare(flare) for flare in flares
+                                          if flare.get('flareID') and flare.get('beginTime')
+                                          and flare['flareID'] not in known], columns=FLARE_COLUMNS))
+        fresh = fresh[fresh['beginEpoch'] >= cutoff]
+        self.stats['new_flares'] += len(fresh)
+        # The long-lived alert engine and forecaster only ever see each flare once; observing
+        # also advances the alert rules to this cycle's forecast time, new flares or not
+        self.ai.observe_alerts(fresh)
+        self.ai.update_forecast(fresh)
+
+        window = self.window[self.window['beginEpoch'] >= cutoff]
+        if len(fresh):
+            window = pd.concat([window, fresh], ignore_index=True)
+        self.window = window.sort_values('beginEpoch', kind='stable').reset_index(drop=True)
+        return self.window
+
+    def load_window(self):
+        """Rolling window as of startup, from the archive, so a restart keeps its context"""
+        history = self.ai.archive.load()
+        self.ai.fit_forecast(history)
+        window = history[history['beginEpoch'] >= int(time.time() - self.window_hours * 3600)]
+        window = window.reset_index(drop=True)
+        self.ai.observe_alerts(window)
+        return window
+
+    async def poll(self, reports):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while not self.stopping.is_set():
+            self.cycle += 1
+            self.stats['polls'] += 1
+            self.stats['last_poll'] = time.time()
+            try:
+                window = await loop.run_in_executor(self.executors['fetch'], self.fetch)
+            except Exception as error:
+                self.stats['poll_errors'] += 1
+                self.ai.terminal.print(f"⚠️  Poll {self.cycle} failed ({error}); keeping the last window")
+            else:
+                self.stats['window_flares'] = len(window)
+                self.stats['dropped_reports'] += put_latest(reports, (self.cycle, window))
+
+            # A poll that overran skips the missed ticks rather than bursting to catch up
+            next_tick += self.interval
+            now = loop.time()
+            if next_tick < now:
+                missed = int((now - next_tick) // self.interval) + 1
+                self.stats['skipped_ticks'] += missed
+                next_tick += missed * self.interval
+            try:
+                await asyncio.wait_for(self.stopping.wait(), next_tick - now)
+            except asyncio.TimeoutError:
+                pass
+
+    # Stage 2: report
+
+    def write_reports(self, window):
+        # One summary (one alert pass, one forecast) for both files
+        text, report = self.ai.render_reports(window)
+        write_atomic(os.path.join(self.output_dir, 'report.txt'), text.encode('utf-8'))
+        write_atomic(os.path.join(self.output_dir, 'report.json'), report.encode('utf-8'))
+
+    async def report(self, reports, renders):
+        loop = asyncio.get_running_loop()
+        while True:
+            cycle, window = await reports.get()
+            try:
+                # Same flares in the same forecast hour: the outputs on disk are already current
+                state = (tuple(window['flareID']), self.ai.forecast_time())
+                if state == self.last_reported:
+                    self.stats['unchanged'] += 1
+                    continue
+                await loop.run_in_executor(self.executors['report'], self.write_reports, window)
+                self.last_reported = state
+                self.reported_cycle = cycle
+                self.stats['reports'] += 1
+                self.stats['dropped_renders'] += put_latest(renders, (cycle, window))
+            except Exception as error:
+                self.ai.terminal.print(f"⚠️  Report for poll {cycle} failed: {error}")
+            finally:
+                reports.task_done()
+
+    # Stage 3: render
+
+    def write_dashboard(self, window):
+        png = self.ai.render_dashboard(window, dpi=self.render_dpi)
+        write_atomic(os.path.join(self.output_dir, 'dashboard.png'), png)
+
+    async def render(self, renders):
+        loop = asyncio.get_running_loop()
+        while True:
+            cycle, window = await renders.get()
+            try:
+                # A newer report was written meanwhile and its render is queued; this one is stale
+                if cycle < self.reported_cycle:
+                    self.stats['stale_renders'] += 1
+                    continue
+                await loop.run_in_executor(self.executors['render'], self.write_dashboard, window)
+                self.stats['renders'] += 1
+                self.stats['last_render'] = time.time()
+            except Exception as error:
+                self.ai.terminal.print(f"⚠️  Render for poll {cycle} failed: {error}")
+            finally:
+                renders.task_done()
+
+    def write_status(self):
+        write_atomic(os.path.join(self.output_dir, 'status.json'),
+                     json.dumps(dict(self.stats, cycle=self.cycle)).encode('utf-8'))
+
+    async def status(self, every):
+        while not self.stopping.is_set():
+            self.write_status()
+            try:
+                await asyncio.wait_for(self.stopping.wait(), every)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, duration=None):
+        """Run until stop() (or SIGINT/SIGTERM), or for `duration` seconds"""
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread / not supported on this platform
+
+        self.window = await loop.run_in_executor(self.executors['fetch'], self.load_window)
+        reports = asyncio.Queue(self.queue_size)
+        renders = asyncio.Queue(self.queue_size)
+        tasks = [
+            asyncio.create_task(self.poll(reports)),
+            asyncio.create_task(self.report(reports, renders)),
+            asyncio.create_task(self.render(renders)),
+            asyncio.create_task(self.status(min(self.interval, 60))),
+        ]
+        try:
+            if duration is None:
+                await self.stopping.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), duration)
+                except asyncio.TimeoutError:
+                    self.stopping.set()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for executor in self.executors.values():
+                executor.shutdown(wait=True)
+            self.write_status()
+        return self.stats
+
+
+def run_daemon(ai_system, interval=POLL_INTERVAL, output_dir='monitor_output', window_hours=7 * 24):
+    daemon = MonitorDaemon(ai_system, interval=interval, window_hours=window_hours, output_dir=output_dir)
+    ai_system.terminal.print(f"🛰️  Monitoring DONKI every {interval / 3600:g}h -> {output_dir}/ (Ctrl+C to stop)")
+    stats = asyncio.run(daemon.run())
+    ai_system.terminal.print(f"👋 Monitor stopped after {stats['polls']} polls, {stats['renders']} renders")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Keep polling DONKI and refreshing the reports and dashboard')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='poll interval in seconds')
+    parser.add_argument('--output-dir', default='monitor_output', help='where the reports are written')
+    parser.add_argument('--window-hours', type=float, default=7 * 24, help='rolling window kept in memory')
+    parser.add_argument('--archive', default='flare_archive')
+    args = parser.parse_args()
+
+    from Nasa import AmazingSpaceWeatherAI
+
+    run_daemon(AmazingSpaceWeatherAI(archive_dir=args.archive), args.interval, args.output_dir, args.window_hours)
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def json_cell(value):
+    """Nested cells (lists, dicts) as canonical JSON strings; everything else unchanged"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def hashable(data):
+    """The frame with nested cells (raw DONKI fields like linkedEvents) made hashable by pandas"""
+    nested = [column for column in data.columns
+              if data[column].dtype == object and data[column].map(lambda v: isinstance(v, (list, dict))).any()]
+    if not nested:
+        return data
+    data = data.copy()
+    for column in nested:
+        data[column] = data[column].map(json_cell)
+    return data
+
+
+def content_hash(data, **options):
+    """Stable SHA-256 of the input data plus the render options"""
+    digest = hashlib.sha256()
+    if isinstance(data, pd.DataFrame):
+        digest.update(json.dumps(list(data.columns), default=str).encode())
+        digest.update(pd.util.hash_pandas_object(hashable(data), index=False).values.tobytes())
+    else:
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Size-bounded LRU cache of rendered artifacts, stored on disk by content hash"""
+
+    def __init__(self, directory='.render_cache', max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # file name -> size, least recently used first
+        self.total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        # Rebuild the LRU order from access times so it survives restarts
+        files = [entry for entry in os.scandir(directory) if entry.is_file() and not entry.name.endswith('.tmp')]
+        for entry in sorted(files, key=lambda e: e.stat().st_mtime):
+            size = entry.stat().st_size
+            self.entries[entry.name] = size
+            self.total_bytes += size
+
+    def path(self, key, suffix):
+        return os.path.join(self.directory, f'{key}.{suffix}')
+
+    def get(self, key, suffix):
+        """Return cached bytes or None"""
+        name = f'{key}.{suffix}'
+        with self.lock:
+            if name not in self.entries:
+                return None
+            self.entries.move_to_end(name)
+        try:
+            with open(self.path(key, suffix), 'rb') as handle:
+                payload = handle.read()
+            os.utime(self.path(key, suffix))
+            return payload
+        except OSError:
+            with self.lock:
+                self.total_bytes -= self.entries.pop(name, 0)
+            return None
+
+    def put(self, key, suffix, payload):
+        """Store bytes under key and evict least recently used entries over the bound"""
+        name = f'{key}.{suffix}'
+        target = self.path(key, suffix)
+        temporary = f'{target}.{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as handle:
+            handle.write(payload)
+        os.replace(temporary, target)
+
+        with self.lock:
+            self.total_bytes += len(payload) - self.entries.pop(name, 0)
+            self.entries[name] = len(payload)
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_name, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                try:
+                    os.remove(os.path.join(self.directory, old_name))
+                except OSError:
+                    pass
+        return payload
+
+    def get_or_render(self, key, suffix, render):
+        """Return the cached artifact, calling render() only on a miss"""
+        payload = self.get(key, suffix)
+        if payload is None:
+            payload = self.put(key, suffix, render())
+        return payload
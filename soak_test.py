@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import os
+import random
+import resource
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+
+from donki_replay import ReplayServer
+from flare_times import format_epochs
+from monitor_daemon import MonitorDaemon
+from Nasa import AmazingSpaceWeatherAI
+from render_cache import RenderCache
+
+
+class SyntheticFeed:
+    """Endless stand-in for DONKI/FLR: new flares keep arriving, and each poll returns the recent ones
+
+    Serves as the replayer behind a ReplayServer (it has the same next_record()).
+    """
+
+    def __init__(self, flares_per_poll=0.5, lookback=600.0, error_rate=0.0, seed=0):
+        self.rng = random.Random(seed)
+        self.flares_per_poll = flares_per_poll
+        self.lookback = lookback
+        self.error_rate = error_rate
+        self.recent = deque()
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def new_flare(self, now):
+        self.count += 1
+        letter = self.rng.choices('BCMX', weights=[30, 55, 13, 2])[0]
+        begin = int(now - self.rng.uniform(0, 60))
+        begin_time, end_time = format_epochs([begin, begin + self.rng.randint(300, 5400)])
+        return {
+            'flareID': f'SOAK-FLR-{self.count}',
+            'classType': f'{letter}{self.rng.uniform(1, 9.9):.1f}',
+            'beginTime': str(begin_time),
+            'endTime': str(end_time),
+            'sourceLocation': f"{self.rng.choice('NS')}{self.rng.randint(0, 40):02d}{self.rng.choice('EW')}{self.rng.randint(0, 90):02d}",
+            'linkedEvents': None,
+        }
+
+    def next_record(self, endpoint):
+        now = time.time()
+        with self.lock:
+            if self.rng.random() < self.error_rate:
+                return {'status': 503, 'body': []}
+            arrivals = int(self.flares_per_poll) + (self.rng.random() < self.flares_per_poll % 1)
+            self.recent.extend((now, self.new_flare(now)) for _ in range(arrivals))
+            while self.recent and self.recent[0][0] < now - self.lookback:
+                self.recent.popleft()
+            return {'status': 200, 'body': [flare for _, flare in self.recent]}
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Soak the monitoring daemon against a local DONKI stand-in')
+    parser.add_argument('--duration', type=float, default=120.0, help='seconds to run')
+    parser.add_argument('--interval', type=float, default=0.1, help='daemon poll interval in seconds')
+    parser.add_argument('--window-hours', type=float, default=0.05)
+    parser.add_argument('--flares-per-poll', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.02, help='share of polls answered with 503')
+    parser.add_argument('--render-delay', type=float, default=0.5, help='extra seconds per render (backpressure)')
+    parser.add_argument('--max-growth-mb', type=float, default=20.0, help='allowed median RSS growth after warm-up')
+    args = parser.parse_args()
+
+    feed = SyntheticFeed(args.flares_per_poll, lookback=args.window_hours * 3600, error_rate=args.error_rate)
+    workdir = tempfile.mkdtemp(prefix='soak-')
+    with ReplayServer(feed) as server:
+        ai_system = AmazingSpaceWeatherAI(donki_url=server.url, archive_dir=os.path.join(workdir, 'archive'))
+        ai_system.render_cache = RenderCache(os.path.join(workdir, 'cache'), max_bytes=16 * 1024 * 1024)
+        render_dashboard = ai_system.render_dashboard
+
+        def slow_render(*call_args, **kwargs):
+            time.sleep(args.render_delay)
+            return render_dashboard(*call_args, **kwargs)
+
+        ai_system.render_dashboard = slow_render
+        daemon = MonitorDaemon(ai_system, interval=args.interval, window_hours=args.window_hours,
+                               output_dir=os.path.join(workdir, 'output'))
+
+        samples = []
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(1.0):
+                samples.append((time.monotonic(), rss_mb()))
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        started = time.monotonic()
+        ai_system.terminal.print(f"🧪 Soaking for {args.duration:g}s against {server.url} (work dir {workdir})")
+        stats = asyncio.run(daemon.run(args.duration))
+        done.set()
+        sampler.join()
+
+    # Memory must stay flat after warm-up: the last quarter's median RSS against the second quarter's
+    # (medians, because every render briefly peaks and the allocator hands memory back in steps)
+    quarter = lambda index: [rss for at, rss in samples
+                             if index * args.duration / 4 <= at - started < (index + 1) * args.duration / 4]
+    early, late = quarter(1), quarter(3)
+    growth = statistics.median(late) - statistics.median(early) if early and late else 0.0
+    expected_polls = args.duration / args.interval
+    failures = []
+    if stats['polls'] < 0.8 * expected_polls:
+        failures.append(f"ingestion stalled: {stats['polls']} polls, expected ~{expected_polls:.0f}")
+    if stats['renders'] == 0:
+        failures.append("nothing was rendered")
+    if growth > args.max_growth_mb:
+        failures.append(f"RSS grew {growth:.1f} MB after warm-up")
+
+    ai_system.terminal.print(
+        f"📈 polls {stats['polls']} (errors {stats['poll_errors']}, skipped ticks {stats['skipped_ticks']}), "
+        f"new flares {stats['new_flares']}, window {stats['window_flares']}",
+        f"🧾 reports {stats['reports']} (unchanged {stats['unchanged']}, coalesced {stats['dropped_reports']}), "
+        f"renders {stats['renders']} (coalesced {stats['dropped_renders']}, stale {stats['stale_renders']})",
+        f"🧠 RSS median {statistics.median(early) if early else rss_mb():.1f} MB -> "
+        f"{statistics.median(late) if late else rss_mb():.1f} MB (growth {growth:+.1f} MB, "
+        f"peak {max(rss for _, rss in samples) if samples else rss_mb():.1f} MB)",
+    )
+    if failures:
+        raise SystemExit("❌ Soak failed: " + "; ".join(failures))
+    ai_system.terminal.print("✅ Soak passed")
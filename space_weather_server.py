@@ -0,0 +1,179 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+import time
+
+from Nasa import AmazingSpaceWeatherAI
+from flare_times import MISSING
+
+ROUTES = {
+    '/flares': 'application/json',
+    '/report': 'application/json',
+    '/risk': 'application/json',
+    '/dashboard.png': 'image/png',
+}
+
+STATUS_LINES = {
+    200: b'HTTP/1.1 200 OK\r\n',
+    304: b'HTTP/1.1 304 Not Modified\r\n',
+    404: b'HTTP/1.1 404 Not Found\r\n',
+    405: b'HTTP/1.1 405 Method Not Allowed\r\n',
+    500: b'HTTP/1.1 500 Internal Server Error\r\n',
+}
+
+
+class CachedResponse:
+    """Pre-encoded response for one route at one archive version"""
+
+    def __init__(self, version, content_type, body):
+        self.version = version
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        headers = (f'Content-Type: {content_type}\r\n'
+                   f'ETag: {self.etag}\r\n'
+                   'Cache-Control: no-cache\r\n')
+        self.full_head = STATUS_LINES[200] + (headers + f'Content-Length: {len(body)}\r\n').encode()
+        self.not_modified_head = STATUS_LINES[304] + (headers + 'Content-Length: 0\r\n').encode()
+
+
+class SpaceWeatherService:
+    """Async HTTP front-end over the local flare archive; never calls DONKI itself"""
+
+    def __init__(self, archive_dir='flare_archive', refresh_interval=1.0):
+        # No HTTP client: requests are answered from the archive only
+        self.ai_system = AmazingSpaceWeatherAI(http=None, archive_dir=archive_dir)
+        self.archive = self.ai_system.archive
+        self.refresh_interval = refresh_interval
+        self.version = None
+        self.version_checked = 0.0
+        self.data = None
+        self.data_version = None
+        self.data_lock = threading.Lock()
+        self.responses = {}
+        self.build_locks = {route: asyncio.Lock() for route in ROUTES}
+
+    def current_version(self):
+        """Archive fingerprint plus forecast hour, re-read at most once per refresh interval"""
+        now = time.monotonic()
+        if self.version is None or now - self.version_checked >= self.refresh_interval:
+            self.version = (self.archive.version(), self.ai_system.forecast_time())
+            self.version_checked = now
+        return self.version
+
+    def archive_data(self, version):
+        """Archive contents at this version; routes building concurrently load and fold it in once"""
+        with self.data_lock:
+            if self.data_version != version:
+                data = self.archive.load()
+                # Fit the forecaster once; after that only newly archived flares are folded in
+                if self.data is None:
+                    self.ai_system.fit_forecast(data)
+                else:
+                    self.ai_system.update_forecast(data[~data['flareID'].isin(self.data['flareID'])])
+                self.data = data
+                self.data_version = version
+            return self.data
+
+    def build_body(self, route, version):
+        """Render one route's payload (runs in a worker thread)"""
+        data = self.archive_data(version)
+        if route == '/flares':
+            records = data.astype(object).where(data.notna() & (data != MISSING), None)
+            return json.dumps(records.to_dict(orient='records')).encode('utf-8')
+        if route == '/report':
+            return self.ai_system.render_json_report(data).encode('utf-8')
+        if route == '/risk':
+            risk_percent = self.ai_system.calculate_risk_percent(data)
+            return json.dumps({
+                'total_flares': len(data),
+                'risk_percent': round(risk_percent, 1),
+                'forecast_24h': self.ai_system.forecast_flares(data),
+                'color': self.ai_system.get_risk_color(risk_percent)
+            }).encode('utf-8')
+        return self.ai_system.render_dashboard(data)
+
+    async def response_for(self, route):
+        """Cached response for the route at the current version, or None if building it failed"""
+        version = self.current_version()
+        cached = self.responses.get(route)
+        if cached is not None and cached.version == version:
+            return cached
+
+        # One build per route and version, however many requests are waiting on it
+        async with self.build_locks[route]:
+            cached = self.responses.get(route)
+            if cached is None or cached.version != version:
+                try:
+                    body = await asyncio.get_running_loop().run_in_executor(None, self.build_body, route, version)
+                except Exception as error:
+                    # Not cached: the next request tries again
+                    print(f"⚠️  Building {route} failed: {error!r}")
+                    return None
+                cached = CachedResponse(version, ROUTES[route], body)
+                self.responses[route] = cached
+        return cached
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, protocol = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and (protocol == 'HTTP/1.1' or headers.get('connection', '').lower() == 'keep-alive'))
+                connection = b'Connection: keep-alive\r\n\r\n' if keep_alive else b'Connection: close\r\n\r\n'
+
+                route = target.split('?', 1)[0]
+                if method not in ('GET', 'HEAD'):
+                    writer.write(STATUS_LINES[405] + b'Content-Length: 0\r\n' + connection)
+                elif route not in ROUTES:
+                    writer.write(STATUS_LINES[404] + b'Content-Length: 0\r\n' + connection)
+                else:
+                    cached = await self.response_for(route)
+                    if cached is None:
+                        writer.write(STATUS_LINES[500] + b'Content-Length: 0\r\n' + connection)
+                    elif headers.get('if-none-match') == cached.etag:
+                        writer.write(cached.not_modified_head + connection)
+                    elif method == 'HEAD':
+                        writer.write(cached.full_head + connection)
+                    else:
+                        writer.write(cached.full_head + connection + cached.body)
+
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        print(f"🛰️  Space weather API listening on http://{host}:{port} ({', '.join(ROUTES)})")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve the space-weather report from the local flare archive')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--archive', default='flare_archive')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(SpaceWeatherService(args.archive).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Space weather API stopped")
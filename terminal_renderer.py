@@ -0,0 +1,175 @@
+import os
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+ESCAPE_SEQUENCE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+
+@lru_cache(maxsize=4096)
+def char_width(char):
+    """Terminal cells taken by one character: 2 for wide (emoji, CJK), 0 for joiners and variation selectors"""
+    if unicodedata.category(char) in ('Mn', 'Me', 'Cf') or '\ufe00' <= char <= '\ufe0f':
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in 'WF' else 1
+
+
+def wrap(text, column, columns):
+    """(rows wrapped, final column) for text written from `column` on a terminal `columns` wide.
+
+    A character that does not fit wraps the row, so a wide emoji never straddles
+    the edge; a row filled exactly only wraps once the next character comes.
+    """
+    rows = 0
+    for char in ESCAPE_SEQUENCE.sub('', text):
+        width = char_width(char)
+        if column + width > columns:
+            rows += 1
+            column = 0
+        column += width
+    return rows, column
+
+
+def line_rows(line, columns):
+    """Screen rows a line takes when written from the first column"""
+    return wrap(line, 0, columns)[0] + 1
+
+
+class Terminal:
+    """Writes whole frames with one syscall and tracks what is on screen"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.writes = 0
+
+    @property
+    def output(self):
+        # Resolved on every write so redirected stdout (CI, tests) keeps working
+        return self.stream or sys.stdout
+
+    @property
+    def ansi(self):
+        output = self.output
+        return (hasattr(output, 'isatty') and output.isatty()
+                and os.environ.get('TERM', '') != 'dumb' and 'NO_COLOR' not in os.environ)
+
+    def size(self):
+        """(columns, rows) of the terminal behind the output"""
+        try:
+            return tuple(os.get_terminal_size(self.output.fileno()))
+        except (AttributeError, OSError, ValueError):
+            return 80, 24
+
+    def write(self, text):
+        output = self.output
+        try:
+            descriptor = output.fileno()
+        except (AttributeError, OSError, ValueError):
+            descriptor = None
+
+        if descriptor is None:
+            output.write(text)
+            output.flush()
+        else:
+            # Anything print() left in Python's buffer must go out first
+            output.flush()
+            payload = text.encode(getattr(output, 'encoding', None) or 'utf-8', errors='replace')
+            while payload:
+                written = os.write(descriptor, payload)
+                payload = payload[written:]
+        self.writes += 1
+
+    def print(self, *lines):
+        """Write several lines as a single frame"""
+        self.write('\n'.join(lines) + '\n')
+
+    def prompt(self, text):
+        """input() with the prompt written through the terminal"""
+        self.write(text)
+        return input()
+
+
+class Frame:
+    """Line buffer for one screen or report"""
+
+    def __init__(self):
+        self.lines = []
+
+    def add(self, line=''):
+        self.lines.append(line)
+        return self
+
+    def extend(self, lines):
+        self.lines.extend(lines)
+        return self
+
+    def text(self):
+        return '\n'.join(self.lines) + '\n'
+
+    def show(self, terminal=None):
+        (terminal or default_terminal).write(self.text())
+
+
+class StatusDashboard:
+    """Status block that, on ANSI terminals, rewrites only its changed lines in place.
+
+    The block is redrawn in place only while it is the last thing written; after
+    any other output it is written out fresh below it. Wrapped lines are counted
+    by their screen rows.
+    """
+
+    def __init__(self, terminal=None):
+        self.terminal = terminal or default_terminal
+        self.lines = []
+        self.heights = []
+        self.columns = None
+        self.drawn_at = None
+
+    def draw(self, lines, fresh=False):
+        """Show the block; fresh=True always writes it out in full"""
+        terminal = self.terminal
+        columns = terminal.size()[0]
+        heights = [line_rows(line, columns) for line in lines]
+        in_place = (not fresh and terminal.ansi and self.drawn_at == terminal.writes
+                    and columns == self.columns and heights == self.heights)
+
+        if not in_place:
+            terminal.write('\n'.join(lines) + '\n')
+        else:
+            changed = [old != new for old, new in zip(self.lines, lines)]
+            if any(changed):
+                # Up to the block's first row, then clear-and-rewrite or skip each line
+                parts = [f'\x1b[{sum(heights)}F']
+                for line, height, dirty in zip(lines, heights, changed):
+                    if dirty:
+                        parts.append('\x1b[2K\x1b[1E' * (height - 1) + '\x1b[2K')
+                        if height > 1:
+                            parts.append(f'\x1b[{height - 1}F')
+                        parts.append(f'{line}\x1b[1E')
+                    else:
+                        parts.append(f'\x1b[{height}E')
+                terminal.write(''.join(parts))
+
+        self.lines = list(lines)
+        self.heights = heights
+        self.columns = columns
+        self.drawn_at = terminal.writes
+
+
+BAR_COLORS = ((75, '🟩'), (50, '🟨'), (25, '🟧'), (0, '🟥'))
+
+
+@lru_cache(maxsize=512)
+def bar_body(filled, color, width=20):
+    """Cached bar glyphs, so refreshes don't rebuild them by concatenation"""
+    return color * filled + '⬜' * (width - filled)
+
+
+def progress_bar(value, label, max_value=100, width=20):
+    filled = max(0, min(width, int(value / max_value * width)))
+    color = next(glyph for threshold, glyph in BAR_COLORS if value >= threshold or threshold == 0)
+    return f"{label}: |{bar_body(filled, color, width)}| {value}%"
+
+
+default_terminal = Terminal()